@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import sys
+import time
+
+import postman_runner
+from userauth_stub import USERS, start_stub
+
+
+# HdrHistogram-style latency histogram: exact below sub_bucket_count, above that every power of two
+# is split into sub_bucket_count / 2 buckets, so any recorded value is off by less than 1 %
+class LatencyHistogram:
+    def __init__(self, significant_digits=2):
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _bucket(self, value):
+        if value < self.sub_bucket_count:
+            return 0, value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return shift, value >> shift
+
+    @staticmethod
+    def _highest_value(bucket):
+        shift, sub_bucket = bucket
+        return ((sub_bucket + 1) << shift) - 1
+
+    # value in microseconds
+    def record(self, value):
+        value = max(int(value), 0)
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        if not self.count:
+            return 0
+        wanted = max(1, math.ceil(percent / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.counts, key=self._highest_value):
+            seen += self.counts[bucket]
+            if seen >= wanted:
+                return min(self._highest_value(bucket), self.max)
+        return self.max
+
+    def summary_ms(self):
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count / 1000, 3) if self.count else 0,
+            "p50": self.percentile(50) / 1000,
+            "p90": self.percentile(90) / 1000,
+            "p99": self.percentile(99) / 1000,
+            "max": self.max / 1000,
+        }
+
+
+class RequestStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0  # no response at all (connection error, timeout)
+        self.failed_checks = 0  # response arrived but a pm.test failed
+
+    def as_dict(self):
+        total = self.latency.count + self.errors
+        return {
+            **self.latency.summary_ms(),
+            "errors": self.errors,
+            "failed_checks": self.failed_checks,
+            "error_rate": round((self.errors + self.failed_checks) / total, 4) if total else 0,
+        }
+
+
+class LoadTest:
+    def __init__(self, requests, globals_, resolve=None, timeout=10.0, max_connections=100):
+        self.requests = requests
+        self.globals = globals_
+        self.pool = postman_runner.ConnectionPool(max_per_host=max_connections, timeout=timeout, resolve=resolve)
+        self.stats = {f"{r.folder} / {r.name}": RequestStats() for r in requests}
+
+    # started_at is when the request should have been sent; in open-loop mode that is the schedule,
+    # so time spent waiting for a free connection counts as latency (no coordinated omission)
+    async def send(self, request, started_at):
+        stats = self.stats[f"{request.folder} / {request.name}"]
+        try:
+            response = await self.pool.request(request.method, request.url, request.headers, request.body.encode())
+        except (OSError, asyncio.TimeoutError, EOFError, ValueError):
+            stats.errors += 1
+            return
+        stats.latency.record((time.perf_counter() - started_at) * 1_000_000)
+        response.elapsed_ms = (time.perf_counter() - started_at) * 1000
+        if not postman_runner.evaluate(request, response, self.globals).ok:
+            stats.failed_checks += 1
+
+    # Closed loop: `users` virtual users, each sends its next request as soon as the previous one finished
+    async def closed_loop(self, users, duration):
+        deadline = time.perf_counter() + duration
+        requests = itertools.cycle(self.requests)
+
+        async def user():
+            while time.perf_counter() < deadline:
+                await self.send(next(requests), time.perf_counter())
+
+        await asyncio.gather(*(user() for _ in range(users)))
+
+    # Open loop: requests start at a fixed rate no matter how fast the server answers
+    async def open_loop(self, rate, duration):
+        start = time.perf_counter()
+        tasks = []
+        for i, request in enumerate(itertools.cycle(self.requests)):
+            scheduled = start + i / rate
+            if scheduled - start >= duration:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(self.send(request, scheduled)))
+        await asyncio.gather(*tasks)
+
+    async def run(self, mode, concurrency, rate, duration):
+        start = time.perf_counter()
+        try:
+            if mode == "open":
+                await self.open_loop(rate, duration)
+            else:
+                await self.closed_loop(concurrency, duration)
+        finally:
+            await self.pool.close()
+        return self.report(mode, concurrency, rate, time.perf_counter() - start)
+
+    def report(self, mode, concurrency, rate, elapsed):
+        overall = RequestStats()
+        for stats in self.stats.values():
+            overall.latency.merge(stats.latency)
+            overall.errors += stats.errors
+            overall.failed_checks += stats.failed_checks
+        sent = overall.latency.count + overall.errors
+        return {
+            "mode": mode,
+            "concurrency": concurrency if mode == "closed" else None,
+            "rate": rate if mode == "open" else None,
+            "duration_s": round(elapsed, 3),
+            "requests_sent": sent,
+            "throughput_rps": round(sent / elapsed, 1) if elapsed else 0,
+            "connections_opened": self.pool.opened,
+            "latency_unit": "ms",
+            "overall": overall.as_dict(),
+            "requests": {name: stats.as_dict() for name, stats in self.stats.items() if stats.latency.count or stats.errors},
+        }
+
+
+def print_report(report):
+    print(f"\n{report['mode']}-loop load: {report['requests_sent']} requests in {report['duration_s']} s "
+          f"({report['throughput_rps']} req/s, {report['connections_opened']} connections)\n")
+    print(f"{'request':62} {'count':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'err %':>6}")
+    rows = sorted(report["requests"].items()) + [("ALL", report["overall"])]
+    for name, row in rows:
+        print(f"{name[:62]:62} {row['count']:>6} {row['p50']:>8.2f} {row['p90']:>8.2f} {row['p99']:>8.2f} "
+              f"{row['max']:>8.2f} {row['error_rate'] * 100:>6.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the login API collection under load")
+    parser.add_argument("collection", nargs="?", default=postman_runner.COLLECTION)
+    parser.add_argument("--mode", choices=("closed", "open"), default="closed")
+    parser.add_argument("--concurrency", type=int, default=10, help="virtual users in closed-loop mode")
+    parser.add_argument("--rate", type=float, default=100, help="requests per second in open-loop mode")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument("--folder", action="append", default=[], help="default: the two login folders")
+    parser.add_argument("--var", action="append", default=[])
+    parser.add_argument("--global", dest="globals_", action="append", default=[])
+    parser.add_argument("--resolve", action="append", default=[])
+    parser.add_argument("--stub", action="store_true", help="start the local userauth.php stand-in and load it")
+    parser.add_argument("--stub-delay-ms", type=float, default=0)
+    parser.add_argument("--report", default="load_report.json")
+    args = parser.parse_args(argv)
+
+    variables = {**postman_runner.DEFAULT_VARIABLES, **postman_runner.parse_pairs(args.var)}
+    resolve = postman_runner.parse_pairs(args.resolve)
+    if args.stub:
+        server = start_stub(delay_ms=args.stub_delay_ms)
+        resolve["testovani.kitner.cz"] = f"127.0.0.1:{server.server_address[1]}"
+        variables = {"heslo novak": USERS["novak"], "heslo admin": USERS["admin"], **variables}
+
+    folders = args.folder or ["Chrome login tests", "Mozilla login tests"]
+    requests = [r for r in postman_runner.load_collection(args.collection, variables) if r.folder in folders]
+    globals_ = {**postman_runner.DEFAULT_GLOBALS, **postman_runner.parse_pairs(args.globals_)}
+
+    load_test = LoadTest(requests, globals_, resolve, max_connections=max(args.concurrency, 1))
+    report = asyncio.run(load_test.run(args.mode, args.concurrency, args.rate, args.duration))
+    print_report(report)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\nReport written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
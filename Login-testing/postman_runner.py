@@ -0,0 +1,357 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import ssl
+import sys
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+COLLECTION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Login_API_testing.postman_collection")
+
+# Value of {{kitner testovani}} used by the requests that have the URL written out
+DEFAULT_VARIABLES = {"kitner testovani": "testovani.kitner.cz/login_app/userauth.php"}
+DEFAULT_GLOBALS = {"target_response_time": "200"}
+
+
+@dataclass
+class Assertion:
+    kind: str  # status, response_time, json_field, header, body_includes
+    expected: object
+    field: str = ""
+
+
+@dataclass
+class PmTest:
+    name: str
+    assertions: list
+    unsupported: list = field(default_factory=list)
+
+
+@dataclass
+class PostmanRequest:
+    name: str
+    folder: str
+    method: str
+    url: str
+    headers: dict
+    body: str
+    tests: list
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict  # lower-case header name -> value
+    body: bytes
+    elapsed_ms: float
+
+    def json(self):
+        return json.loads(self.body)
+
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+
+# --- collection parsing -------------------------------------------------------------------
+
+PM_TEST = re.compile(r'pm\.test\(\s*"([^"]*)"\s*,\s*function\s*\(\)\s*\{(.*?)\}\s*\)\s*;', re.S)
+STATUS = re.compile(r"pm\.response\.to\.have\.status\((\d+)\)")
+RESPONSE_TIME = re.compile(r"pm\.expect\(pm\.response\.responseTime\)\.to\.be\.below\((.+?)\)\s*;")
+GLOBAL_LIMIT = re.compile(r'parseInt\(pm\.globals\.get\("([^"]+)"\)\)')
+JSON_FIELD = re.compile(r'pm\.expect\(jsonData\.(\w+)\)\.to\.eql\(\s*"([^"]*)"\s*,?\s*\)')
+HEADER = re.compile(r'pm\.response\.to\.have\.header\("([^"]+)"\)')
+BODY_INCLUDES = re.compile(r'pm\.expect\(pm\.response\.text\(\)\)\.to\.include\("([^"]*)"\)')
+NOT_ASSERTIONS = re.compile(r"^(var \w+ = pm\.response\.json\(\);)?$")
+
+
+# Turns the JS of a "test" event into PmTest objects with Python-checkable assertions
+def parse_tests(script):
+    tests = []
+    for name, body in PM_TEST.findall(script):
+        test = PmTest(name, [])
+        for statement in filter(None, (line.strip() for line in body.replace("\r", "").split("\n"))):
+            if match := STATUS.search(statement):
+                test.assertions.append(Assertion("status", int(match[1])))
+            elif match := RESPONSE_TIME.search(statement):
+                limit = GLOBAL_LIMIT.fullmatch(match[1].strip())
+                test.assertions.append(Assertion("response_time", limit[1] if limit else int(match[1]), "global" if limit else ""))
+            elif match := JSON_FIELD.search(statement):
+                test.assertions.append(Assertion("json_field", match[2], match[1]))
+            elif match := HEADER.search(statement):
+                test.assertions.append(Assertion("header", match[1]))
+            elif match := BODY_INCLUDES.search(statement):
+                test.assertions.append(Assertion("body_includes", match[1]))
+            elif not NOT_ASSERTIONS.match(statement):
+                test.unsupported.append(statement)
+        tests.append(test)
+    return tests
+
+
+def substitute(text, variables):
+    return re.sub(r"\{\{([^}]+)\}\}", lambda m: str(variables.get(m[1], m[0])), text)
+
+
+def normalize_url(url):
+    url = url.strip()
+    return url if re.match(r"^https?://", url) else "http://" + url
+
+
+# Flattens folders into a list of PostmanRequest with variables already substituted
+def load_collection(path, variables):
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+    if "schema.getpostman.com/json/collection/v2" not in collection["info"].get("schema", ""):
+        raise ValueError(f"{path} is not a Postman v2 collection")
+    variables = {**{v["key"]: v["value"] for v in collection.get("variable", [])}, **variables}
+
+    requests = []
+
+    def walk(items, folder):
+        for item in items:
+            if "item" in item:
+                walk(item["item"], item["name"])
+                continue
+            request = item["request"]
+            url = request["url"]["raw"] if isinstance(request["url"], dict) else request["url"]
+            script = "".join(
+                "\n".join(event["script"]["exec"]) for event in item.get("event", []) if event["listen"] == "test"
+            )
+            requests.append(PostmanRequest(
+                name=item["name"],
+                folder=folder,
+                method=request["method"],
+                url=normalize_url(substitute(url, variables)),
+                headers={h["key"]: substitute(h["value"], variables) for h in request.get("header", []) if not h.get("disabled")},
+                body=substitute(request.get("body", {}).get("raw", ""), variables),
+                tests=parse_tests(script),
+            ))
+
+    walk(collection["item"], "")
+    return requests
+
+
+# --- assertions ---------------------------------------------------------------------------
+
+# None when the assertion holds, otherwise a message in the style of the Postman test runner
+def check(assertion, response, globals_):
+    if assertion.kind == "status":
+        if response.status != assertion.expected:
+            return f"expected status {assertion.expected}, got {response.status}"
+    elif assertion.kind == "response_time":
+        limit = int(globals_[assertion.expected]) if assertion.field == "global" else assertion.expected
+        if not response.elapsed_ms < limit:
+            return f"expected response time {response.elapsed_ms:.0f} ms to be below {limit} ms"
+    elif assertion.kind == "json_field":
+        try:
+            actual = response.json().get(assertion.field)
+        except (ValueError, AttributeError):
+            return "response is not a JSON object"
+        if actual != assertion.expected:
+            return f"expected {assertion.field} {actual!r} to deeply equal {assertion.expected!r}"
+    elif assertion.kind == "header":
+        if assertion.expected.lower() not in response.headers:
+            return f"expected response to have header {assertion.expected}"
+    elif assertion.kind == "body_includes":
+        if assertion.expected not in response.text():
+            return f"expected response body to include {assertion.expected!r}"
+    return None
+
+
+# --- pooled keep-alive HTTP/1.1 client ----------------------------------------------------
+
+class ConnectionPool:
+    # resolve: {"host": "ip:port"} sends requests for host elsewhere, like curl --resolve
+    def __init__(self, max_per_host=10, timeout=10.0, resolve=None):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.resolve = resolve or {}
+        self.idle = {}
+        self.limits = {}
+        self.opened = 0
+
+    def _address(self, parts):
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        target = self.resolve.get(parts.hostname)
+        if target:
+            host, _, port = target.partition(":")
+            return host, int(port or 80), False
+        return parts.hostname, port, parts.scheme == "https"
+
+    async def _connect(self, host, port, use_ssl, server_name):
+        self.opened += 1
+        context = ssl.create_default_context() if use_ssl else None
+        return await asyncio.open_connection(host, port, ssl=context, server_hostname=server_name if use_ssl else None)
+
+    async def request(self, method, url, headers=None, body=b""):
+        parts = urlsplit(url)
+        host, port, use_ssl = self._address(parts)
+        key = (host, port, use_ssl)
+        limit = self.limits.setdefault(key, asyncio.Semaphore(self.max_per_host))
+        async with limit:
+            return await asyncio.wait_for(self._request(key, parts, method, headers or {}, body), self.timeout)
+
+    async def _request(self, key, parts, method, headers, body):
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {parts.netloc}", f"Content-Length: {len(body)}",
+                 "Connection: keep-alive", "User-Agent: postman-runner"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        raw = ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+        idle = self.idle.setdefault(key, [])
+        while True:
+            reused = bool(idle)
+            reader, writer = idle.pop() if reused else await self._connect(*key, parts.hostname)
+            start = time.perf_counter()
+            try:
+                writer.write(raw)
+                await writer.drain()
+                status, response_headers, response_body = await self._read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError, EOFError):
+                writer.close()
+                if reused:
+                    continue  # the server closed an idle keep-alive connection, retry on a new one
+                raise
+            except BaseException:
+                # cancelled by the timeout in request() or a malformed response: the connection is
+                # mid-request, it can neither go back to the pool nor be left open
+                writer.close()
+                raise
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if response_headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                idle.append((reader, writer))
+            return Response(status, response_headers, response_body, elapsed_ms)
+
+    async def _read_response(self, reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise EOFError("connection closed")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = b""
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                body += await reader.readexactly(size)
+                await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # trailers
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, body
+
+    async def close(self):
+        for connections in self.idle.values():
+            for _, writer in connections:
+                writer.close()
+        self.idle.clear()
+
+
+# --- running ------------------------------------------------------------------------------
+
+@dataclass
+class Result:
+    request: PostmanRequest
+    response: Response = None
+    error: str = ""
+    failures: list = field(default_factory=list)  # (test name, message)
+    passed: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)  # (test name, unsupported JS)
+
+    @property
+    def ok(self):
+        return not self.error and not self.failures
+
+
+def evaluate(request, response, globals_):
+    result = Result(request, response)
+    for test in request.tests:
+        if test.unsupported:
+            result.skipped.append((test.name, "; ".join(test.unsupported)))
+            continue
+        messages = [m for m in (check(a, response, globals_) for a in test.assertions) if m]
+        if messages:
+            result.failures.append((test.name, messages[0]))
+        else:
+            result.passed.append(test.name)
+    return result
+
+
+async def run_request(pool, request, globals_):
+    try:
+        response = await pool.request(request.method, request.url, request.headers, request.body.encode())
+    except (OSError, asyncio.TimeoutError, EOFError, ValueError) as error:
+        return Result(request, error=f"{type(error).__name__}: {error}")
+    return evaluate(request, response, globals_)
+
+
+async def run_collection(requests, globals_, concurrency=10, resolve=None, timeout=10.0):
+    pool = ConnectionPool(max_per_host=concurrency, timeout=timeout, resolve=resolve)
+    try:
+        return await asyncio.gather(*(run_request(pool, request, globals_) for request in requests))
+    finally:
+        await pool.close()
+
+
+def print_results(results):
+    for result in results:
+        status = f"{result.response.status} {result.response.elapsed_ms:.0f} ms" if result.response else result.error
+        print(f"{'PASS' if result.ok else 'FAIL'}  {result.request.folder} / {result.request.name}  [{status}]")
+        for name, message in result.failures:
+            print(f"        x {name}: {message}")
+        for name, statement in result.skipped:
+            print(f"        - {name}: not supported ({statement})")
+    tests = sum(len(r.passed) + len(r.failures) for r in results)
+    failed = sum(len(r.failures) for r in results)
+    errors = sum(1 for r in results if r.error)
+    print(f"\n{len(results)} requests, {errors} errors, {tests} tests, {failed} failed")
+
+
+def parse_pairs(pairs):
+    return dict(pair.split("=", 1) for pair in pairs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Postman v2.1 collection with concurrent keep-alive requests")
+    parser.add_argument("collection", nargs="?", default=COLLECTION)
+    parser.add_argument("--var", action="append", default=[], help="collection variable, e.g. --var 'heslo novak=...'")
+    parser.add_argument("--global", dest="globals_", action="append", default=[], help="pm.globals value, key=value")
+    parser.add_argument("--folder", action="append", default=[], help="run only requests from these folders")
+    parser.add_argument("--resolve", action="append", default=[], help="host=ip:port, e.g. to hit a local stub")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--report", help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    requests = load_collection(args.collection, {**DEFAULT_VARIABLES, **parse_pairs(args.var)})
+    if args.folder:
+        requests = [r for r in requests if r.folder in args.folder]
+    globals_ = {**DEFAULT_GLOBALS, **parse_pairs(args.globals_)}
+
+    start = time.perf_counter()
+    results = asyncio.run(run_collection(requests, globals_, args.concurrency, parse_pairs(args.resolve), args.timeout))
+    print_results(results)
+    print(f"Finished in {time.perf_counter() - start:.2f} s")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump([{
+                "folder": r.request.folder, "name": r.request.name, "error": r.error,
+                "status": r.response.status if r.response else None,
+                "elapsed_ms": r.response.elapsed_ms if r.response else None,
+                "passed": r.passed, "failures": r.failures, "skipped": r.skipped,
+            } for r in results], f, indent=2, ensure_ascii=False)
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import asyncio
+
+import postman_runner
+from load_runner import LatencyHistogram, LoadTest
+from userauth_stub import USERS, start_stub
+
+VARIABLES = {**postman_runner.DEFAULT_VARIABLES, "heslo novak": USERS["novak"], "heslo admin": USERS["admin"]}
+
+
+def test_histogram_percentiles_within_one_percent():
+    histogram = LatencyHistogram()
+    for value in range(1, 100001):
+        histogram.record(value)
+    for percent in (50, 90, 99):
+        expected = percent * 1000
+        assert abs(histogram.percentile(percent) - expected) / expected < 0.01
+    assert histogram.percentile(100) == histogram.max == 100000
+
+
+def test_histogram_merge():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    a.record(10)
+    b.record(5000)
+    a.merge(b)
+    assert (a.count, a.min, a.max) == (2, 10, 5000)
+
+
+def run_load(mode):
+    server = start_stub()
+    try:
+        requests = [r for r in postman_runner.load_collection(postman_runner.COLLECTION, VARIABLES)
+                    if r.folder == "Chrome login tests"]
+        load_test = LoadTest(requests, {"target_response_time": "1000"},
+                             resolve={"testovani.kitner.cz": f"127.0.0.1:{server.server_address[1]}"}, max_connections=4)
+        return asyncio.run(load_test.run(mode, concurrency=4, rate=200, duration=0.5))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_closed_loop_against_stub():
+    report = run_load("closed")
+    assert report["overall"]["count"] > 0
+    assert report["overall"]["error_rate"] == 0
+    assert report["connections_opened"] <= 4
+    assert len(report["requests"]) == 16
+
+
+def test_open_loop_sends_at_rate():
+    report = run_load("open")
+    assert report["requests_sent"] == 100
+    assert report["overall"]["errors"] == 0
@@ -0,0 +1,99 @@
+import asyncio
+import gc
+import warnings
+
+import pytest
+
+import postman_runner
+from userauth_stub import USERS, start_stub
+
+VARIABLES = {**postman_runner.DEFAULT_VARIABLES, "heslo novak": USERS["novak"], "heslo admin": USERS["admin"]}
+FOLDERS = ("Chrome login tests", "Mozilla login tests")
+
+
+@pytest.fixture(scope="module")
+def stub():
+    server = start_stub()
+    yield f"127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def login_requests():
+    requests = postman_runner.load_collection(postman_runner.COLLECTION, VARIABLES)
+    return [r for r in requests if r.folder in FOLDERS]
+
+
+def test_collection_is_parsed():
+    requests = login_requests()
+    assert len(requests) == 32
+    assert all(r.url == "http://testovani.kitner.cz/login_app/userauth.php" for r in requests)
+    assert all("{{" not in r.body for r in requests)
+    assert all(not test.unsupported for r in requests for test in r.tests)
+
+
+def test_response_time_uses_global():
+    first = login_requests()[0]
+    limit = [a for test in first.tests for a in test.assertions if a.kind == "response_time"][0]
+    assert (limit.field, limit.expected) == ("global", "target_response_time")
+
+
+def test_all_login_requests_pass_against_stub(stub):
+    results = asyncio.run(postman_runner.run_collection(
+        login_requests(), {"target_response_time": "1000"}, concurrency=8,
+        resolve={"testovani.kitner.cz": stub},
+    ))
+    assert [(r.request.name, r.error, r.failures) for r in results if not r.ok] == []
+    assert sum(len(r.passed) for r in results) == 131
+
+
+def test_wrong_expectation_is_reported(stub):
+    request = login_requests()[0]
+    request.body = request.body.replace(USERS["novak"], "wrong")
+    result = asyncio.run(postman_runner.run_collection([request], {"target_response_time": "1000"},
+                                                       resolve={"testovani.kitner.cz": stub}))[0]
+    assert not result.ok
+    assert ("JSON reason equ correct", "expected reason 'spatne heslo' to deeply equal 'correct'") in result.failures
+
+
+def test_connections_are_reused(stub):
+    async def run():
+        pool = postman_runner.ConnectionPool(max_per_host=2, resolve={"testovani.kitner.cz": stub})
+        try:
+            for request in login_requests():
+                await pool.request(request.method, request.url, request.headers, request.body.encode())
+        finally:
+            await pool.close()
+        return pool.opened
+
+    assert asyncio.run(run()) == 1
+
+
+# A request cut off by the timeout closes its connection instead of leaving it to the garbage collector
+def test_timed_out_connection_is_closed():
+    async def run():
+        closed = asyncio.Event()
+
+        async def never_answer(reader, writer):
+            await reader.read()  # returns once the client closes its side
+            closed.set()
+            writer.close()
+
+        server = await asyncio.start_server(never_answer, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        pool = postman_runner.ConnectionPool(timeout=0.2)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await pool.request("GET", f"http://127.0.0.1:{port}/")
+            await asyncio.wait_for(closed.wait(), 2)
+            assert pool.idle[("127.0.0.1", port, False)] == []
+        finally:
+            await pool.close()
+            server.close()
+            await server.wait_closed()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        asyncio.run(run())
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
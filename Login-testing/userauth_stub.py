@@ -0,0 +1,78 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Offline stand-in for http://testovani.kitner.cz/login_app/userauth.php,
+# answers the way the Postman collection expects the real service to answer
+USERS = {"novak": "heslo-novak", "admin": "heslo-admin"}
+MAX_USERNAME_LENGTH = 30
+
+
+def authenticate(users, username, password):
+    if not username:
+        return "403", "chybi prihlasovacijmeno"
+    if len(username) > MAX_USERNAME_LENGTH:
+        return "500", ""
+    if username not in users:
+        return "403", "neexistujici uzivatel"
+    if users[username] != password:
+        return "403", "spatne heslo"
+    return "200", "correct"
+
+
+class UserAuthHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "Apache"
+    disable_nagle_algorithm = True
+    users = USERS
+    delay = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            data = {}
+        if self.delay:
+            time.sleep(self.delay)
+        response, reason = authenticate(self.users, data.get("username", ""), data.get("password", ""))
+        self.send_chunked(json.dumps({"response": response, "reason": reason}).encode())
+
+    # Same headers as the real PHP backend, the collection checks all of them
+    def send_chunked(self, body):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "keep-alive")
+        self.send_header("X-Powered-By", "PHP/8.1")
+        self.send_header("Cache-Control", "no-store, no-cache, must-revalidate")
+        self.send_header("Pragma", "no-cache")
+        self.end_headers()
+        self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Starts the stub on a background thread, port 0 picks a free port
+def start_stub(host="127.0.0.1", port=0, users=None, delay_ms=0):
+    handler = type("Handler", (UserAuthHandler,), {"users": users or USERS, "delay": delay_ms / 1000})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the kitner userauth.php login API")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--delay-ms", type=float, default=0, help="artificial processing time per request")
+    args = parser.parse_args()
+    server = start_stub(port=args.port, delay_ms=args.delay_ms)
+    print(f"userauth stub listening on http://127.0.0.1:{args.port}/login_app/userauth.php")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,68 +1,77 @@
 import re
-from playwright.sync_api import Playwright, sync_playwright, expect
+from playwright.sync_api import Page, expect
 
-
-def launch_browser(playwright: Playwright):
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    return browser, context, page
+from instrumentation import timed
+from locators import locate
 
 
+@timed
 def add_task(page, task):
-    textbox = page.get_by_role("textbox", name="What needs to be done?")
+    textbox = locate(page, "todomvc", "new_todo")
     textbox.click()
     textbox.fill(task)
     textbox.press("Enter")
 
 
+@timed
 def assert_task_added(page, task):
-    expect(page.get_by_role("listitem").filter(has_text=task), f"item {task} was not added to the list").to_be_visible()
+    expect(locate(page, "todomvc", "todo_item", task=task), f"item {task} was not added to the list").to_be_visible()
 
+@timed
 def delete_task(page, task):
-    list_item = page.get_by_role("listitem").filter(has_text=task)
-    list_item.locator("button.destroy").click()
+    list_item = locate(page, "todomvc", "todo_item", task=task)
+    list_item.hover()  # the delete button only shows while the item is hovered
+    locate(list_item, "todomvc", "delete_button").click()
 
+@timed
 def edit_task(page, old_task, new_task):
-    list_item = page.get_by_role("listitem").filter(has_text=old_task)
-    list_item.locator("label").dblclick()  # Double-click to edit
-    input_field = list_item.locator("input.edit")
+    list_item = locate(page, "todomvc", "todo_item", task=old_task)
+    locate(list_item, "todomvc", "item_label").dblclick()  # Double-click to edit
+    input_field = locate(list_item, "todomvc", "edit_field")
     input_field.fill(new_task)
     input_field.press("Enter")
 
+@timed
 def assert_total_items_count(page, expected_count):
-    total_items = page.locator("ul.todo-list > li")
+    total_items = locate(page, "todomvc", "todo_items")
     expect(total_items, f"List doesn't have {expected_count} items").to_have_count(expected_count)
 
+@timed
 def mark_task_as_completed(page, task):
-    page.get_by_role("listitem").filter(has_text=task).get_by_label("Toggle Todo").check()
+    list_item = locate(page, "todomvc", "todo_item", task=task)
+    locate(list_item, "todomvc", "toggle").check()
 
+@timed
 def mark_task_as_active(page, task):
-    page.get_by_role("listitem").filter(has_text=task).get_by_label("Toggle Todo").uncheck()
+    list_item = locate(page, "todomvc", "todo_item", task=task)
+    locate(list_item, "todomvc", "toggle").uncheck()
 
+@timed
 def clear_completed_tasks(page):
-    page.get_by_role("button", name="Clear completed").click()
+    locate(page, "todomvc", "clear_completed").click()
 
+@timed
 def assert_no_completed_tasks(page):
-    completed_items = page.locator("ul.todo-list > li.completed")
+    completed_items = locate(page, "todomvc", "completed_items")
     expect(completed_items).to_have_count(0)
 
+@timed
 def assert_task_not_in_list(page, task):
-    expect(page.locator("ul.todo-list"), f"List contains item {task}").not_to_contain_text(task)
+    expect(locate(page, "todomvc", "todo_list"), f"List contains item {task}").not_to_contain_text(task)
 
+@timed
 def assert_task_in_list(page, task):
-    expect(page.locator("ul.todo-list"), f"List doesn't contain item {task}").to_contain_text(task)
+    expect(locate(page, "todomvc", "todo_list"), f"List doesn't contain item {task}").to_contain_text(task)
 
+@timed
 def filter_tasks_by_status(page, status):
-    page.get_by_role("link", name=status).click()
+    locate(page, "todomvc", "filter", status=status).click()
 
 
-def test_add_task(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_add_task(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Define a list of tasks to add to the list
     tasks = ["a1", "a2", "a3"]
@@ -75,16 +84,10 @@ def test_add_task(playwright: Playwright) -> None:
     # Verify total items count after adding tasks
     assert_total_items_count(page, 3)
 
-    # Close the browser and context
-    context.close()
-    browser.close()
-
-def test_filter_active_tasks(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_filter_active_tasks(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Define a list of tasks to add to the list
     tasks = ["a1", "a2", "a3"]
@@ -106,16 +109,10 @@ def test_filter_active_tasks(playwright: Playwright) -> None:
     # Verify total items count for active tasks
     assert_total_items_count(page, 2)
 
-    # Close the browser and context
-    context.close()
-    browser.close()
-
-def test_filter_completed_tasks(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_filter_completed_tasks(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Define a list of tasks to add to the list
     tasks = ["a1", "a2", "a3"]
@@ -137,16 +134,10 @@ def test_filter_completed_tasks(playwright: Playwright) -> None:
     # Verify total items count for completed tasks
     assert_total_items_count(page, 1)
 
-    # Close the browser and context
-    context.close()
-    browser.close()
-
-def test_clear_completed_tasks(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_clear_completed_tasks(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Add tasks to the list
     tasks = ["a1", "a2", "a3"]
@@ -167,17 +158,11 @@ def test_clear_completed_tasks(playwright: Playwright) -> None:
     # Verify the total items count after clearing
     assert_total_items_count(page, 1)  # Only "a3" should remain
 
-    # Close the browser and context
-    context.close()
-    browser.close()
-
 # unedited item still visible after editing..why?
-def test_edit_task(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_edit_task(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Add a task to the list
     add_task(page, "a1")
@@ -195,16 +180,10 @@ def test_edit_task(playwright: Playwright) -> None:
     # Verify total items count remains the same
     assert_total_items_count(page, 1)
 
-    # Close the browser and context
-    context.close()
-    browser.close()
-
-def test_filter_links_visible(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_filter_links_visible(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Add tasks to the list
     tasks = ["a1", "a2", "a3"]
@@ -213,22 +192,16 @@ def test_filter_links_visible(playwright: Playwright) -> None:
         assert_task_added(page, task)
 
     # Assert that filter links are visible
-    filters = page.locator("ul.filters > li > a")
+    filters = locate(page, "todomvc", "filters")
     expect(filters).to_have_count(3)
     expect(filters.nth(0)).to_have_text("All")
     expect(filters.nth(1)).to_have_text("Active")
     expect(filters.nth(2)).to_have_text("Completed")
 
-    # Close the browser and context
-    context.close()
-    browser.close()
-
-def test_delete_task(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_delete_task(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Add tasks to the list
     tasks = ["a1", "a2", "a3"]
@@ -236,12 +209,11 @@ def test_delete_task(playwright: Playwright) -> None:
         add_task(page, task)
         assert_task_added(page, task)
 
-    # Delete task "a2"
-    page.get_by_role("button", name="Delete").click()
-    page.get_by_role("button", name="Delete").click()
-    page.get_by_role("button", name="Delete").click()
+    # Delete every task, the Delete button of an item only shows while it is hovered
+    for task in tasks:
+        delete_task(page, task)
 
-    # Assert that "a2" is no longer in the list
+    # Assert that the tasks are no longer in the list
     assert_task_not_in_list(page, "a1")
     assert_task_not_in_list(page, "a2")
     assert_task_not_in_list(page, "a3")
@@ -249,16 +221,10 @@ def test_delete_task(playwright: Playwright) -> None:
     # Verify total items count after deletion
     assert_total_items_count(page, 0)
 
-    # Close the browser and context
-    context.close()
-    browser.close()
-
-def test_mark_task_as_active(playwright: Playwright) -> None:
-    # Launch browser and navigate to the page
-    browser = playwright.chromium.launch(headless=False)
-    context = browser.new_context()
-    page = context.new_page()
-    page.goto("https://demo.playwright.dev/todomvc#/")
+def test_mark_task_as_active(fresh_page: Page, todomvc_url) -> None:
+    # Browser is shared for the session, fresh_page comes from a new isolated context
+    page = fresh_page
+    page.goto(todomvc_url)
 
     # Add tasks to the list
     tasks = ["a1", "a2", "a3"]
@@ -277,8 +243,4 @@ def test_mark_task_as_active(playwright: Playwright) -> None:
     assert_task_in_list(page, "a1")
 
     # Verify total items count for active tasks
-    assert_total_items_count(page, 3)
-
-    # Close the browser and context
-    context.close()
-    browser.close()
\ No newline at end of file
+    assert_total_items_count(page, 3)
\ No newline at end of file
@@ -0,0 +1,211 @@
+import argparse
+import collections
+import gzip
+import hashlib
+import os
+import re
+import sqlite3
+import time
+
+# Root directory for screenshots and other files produced by tests
+ARTIFACTS_DIR = os.environ.get("ARTIFACTS_DIR", "test-results")
+
+
+# Each parallel worker writes into its own sub-directory so file names never collide
+def worker_id():
+    return os.environ.get("TEST_WORKER_ID") or os.environ.get("PYTEST_XDIST_WORKER") or "main"
+
+
+def artifact_path(filename):
+    directory = os.path.join(ARTIFACTS_DIR, worker_id())
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+
+# Failure artifacts (screenshots, DOM snapshots, traces, last steps) are kept in a content-addressed store
+# shared by all workers; nothing is written for tests that pass
+STORE_DIR = os.path.join(ARTIFACTS_DIR, "store")
+STORE_MAX_BYTES = int(float(os.environ.get("ARTIFACTS_MAX_MB", 200)) * 1024 * 1024)
+
+# ARTIFACTS_TRACE=1 records a Playwright trace for every watched context, it is only saved when the test fails
+TRACE = os.environ.get("ARTIFACTS_TRACE") == "1"
+
+# ARTIFACTS_RING=K keeps the last K browser steps (navigations, console errors, failed requests) in memory
+RING_SIZE = int(os.environ.get("ARTIFACTS_RING", 0))
+
+# PNG and zip (traces) are compressed already
+COMPRESSED_MAGIC = (b"\x89PNG", b"PK\x03\x04")
+
+
+class ArtifactStore:
+    def __init__(self, root=STORE_DIR, max_bytes=STORE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=30)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS objects (digest TEXT PRIMARY KEY, size INTEGER, compressed INTEGER, last_used REAL);
+            CREATE TABLE IF NOT EXISTS artifacts (test_id TEXT, name TEXT, digest TEXT, created REAL);
+        """)
+
+    def object_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    # Stores data once per content; the same screenshot of two failures is one object
+    def put(self, test_id, name, data):
+        digest = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        compressed = not data.startswith(COMPRESSED_MAGIC)
+        payload = gzip.compress(data) if compressed else data
+        path = self.object_path(digest)
+        # One write transaction per put, so two workers storing the same content or an eviction
+        # running meanwhile never see the object row without its file
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.execute("INSERT OR IGNORE INTO objects VALUES (?, ?, ?, ?)", (digest, len(payload), compressed, now))
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(payload)
+                os.replace(path + ".tmp", path)
+            self.db.execute("UPDATE objects SET last_used = ? WHERE digest = ?", (now, digest))
+            self.db.execute("INSERT INTO artifacts VALUES (?, ?, ?, ?)", (test_id, name, digest, now))
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+        self.evict()
+        return digest
+
+    def get(self, digest):
+        row = self.db.execute("SELECT compressed FROM objects WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        with open(self.object_path(digest), "rb") as f:
+            data = f.read()
+        return gzip.decompress(data) if row[0] else data
+
+    def size(self):
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+
+    # Least recently used objects go first until the store fits into max_bytes again
+    def evict(self):
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+        for digest, size in self.db.execute("SELECT digest, size FROM objects ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            if os.path.exists(self.object_path(digest)):
+                os.remove(self.object_path(digest))
+            self.db.execute("DELETE FROM objects WHERE digest = ?", (digest,))
+            self.db.execute("DELETE FROM artifacts WHERE digest = ?", (digest,))
+            total -= size
+        self.db.commit()
+
+    # [(test id, name, digest)] of the stored artifacts, newest first
+    def artifacts(self, test_id=None):
+        sql = "SELECT test_id, name, digest FROM artifacts"
+        params = ()
+        if test_id is not None:
+            sql += " WHERE test_id = ?"
+            params = (test_id,)
+        return self.db.execute(sql + " ORDER BY created DESC", params).fetchall()
+
+    # Writes the artifacts out as plain files, one directory per test
+    def export(self, target):
+        written = 0
+        for test_id, name, digest in self.artifacts():
+            directory = os.path.join(target, re.sub(r"[^A-Za-z0-9_.-]", "_", test_id))
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, name)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(self.get(digest))
+                written += 1
+        return written
+
+    def close(self):
+        self.db.close()
+
+
+# Pages of the running test that get captured if it fails
+watched = []
+steps = collections.deque(maxlen=RING_SIZE or None)
+
+
+def _step(text):
+    steps.append(f"{time.strftime('%H:%M:%S')} {text}")
+
+
+# Registers a page for failure capture of the running test; pages of the pytest-playwright `page` fixture are
+# found by conftest. Pages that outlive a test (session fixtures) are watched again by every test using them
+def watch(page):
+    if page in watched:
+        return page
+    watched.append(page)
+    if TRACE and not getattr(page.context, "_artifacts_tracing", False):
+        page.context.tracing.start(screenshots=True, snapshots=True, sources=False)
+        page.context._artifacts_tracing = True
+    if RING_SIZE and not getattr(page, "_artifacts_ring", False):
+        page._artifacts_ring = True
+        page.on("framenavigated", lambda frame: frame.parent_frame is None and _step(f"navigated to {frame.url}"))
+        page.on("console", lambda message: message.type == "error" and _step(f"console error: {message.text}"))
+        page.on("requestfailed", lambda request: _step(f"request failed: {request.url} {request.failure}"))
+        page.on("pageerror", lambda error: _step(f"page error: {error}"))
+    return page
+
+
+# Test code can add its own steps to the ring buffer
+def record_step(text):
+    if RING_SIZE:
+        _step(text)
+
+
+# Between tests: a trace still running on a page that outlives the test is dropped, the next test starts its own
+def reset():
+    for page in watched:
+        if getattr(page.context, "_artifacts_tracing", False) and not page.is_closed():
+            page.context.tracing.stop()
+            page.context._artifacts_tracing = False
+    watched.clear()
+    steps.clear()
+
+
+# Screenshot, DOM and trace of every open watched page, plus the step ring buffer
+def capture_failure(test_id, pages):
+    store = ArtifactStore()
+    try:
+        for i, page in enumerate(pages):
+            if page.is_closed():
+                continue
+            suffix = f"-{i}" if len(pages) > 1 else ""
+            try:
+                store.put(test_id, f"screenshot{suffix}.png", page.screenshot(full_page=True))
+                store.put(test_id, f"dom{suffix}.html", page.content().encode())
+            except Exception as error:
+                store.put(test_id, f"capture-error{suffix}.txt", str(error).encode())
+            if getattr(page.context, "_artifacts_tracing", False):
+                trace_file = artifact_path(f"trace-{os.getpid()}.zip")
+                page.context.tracing.stop(path=trace_file)
+                page.context._artifacts_tracing = False
+                with open(trace_file, "rb") as f:
+                    store.put(test_id, f"trace{suffix}.zip", f.read())
+                os.remove(trace_file)
+        if steps:
+            store.put(test_id, "steps.txt", "\n".join(steps).encode())
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the stored failure artifacts as plain files")
+    parser.add_argument("target", nargs="?", default=os.path.join(ARTIFACTS_DIR, "failures"))
+    args = parser.parse_args()
+    store = ArtifactStore()
+    print(f"{store.export(args.target)} files written to {args.target}, store size {store.size() / 1024:.0f} kB")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from playwright.async_api import Page, expect
+
+from locators import locate_async as locate
+
+# playwright.async_api versions of the Demo_playwright_tests.py helpers and of ShoppingItem,
+# so one process can drive many pages at once (see async_scheduler.py)
+
+
+async def add_task(page: Page, task):
+    textbox = await locate(page, "todomvc", "new_todo")
+    await textbox.click()
+    await textbox.fill(task)
+    await textbox.press("Enter")
+
+
+async def assert_task_added(page: Page, task):
+    await expect(await locate(page, "todomvc", "todo_item", task=task), f"item {task} was not added to the list").to_be_visible()
+
+
+async def delete_task(page: Page, task):
+    list_item = await locate(page, "todomvc", "todo_item", task=task)
+    await list_item.hover()  # the delete button only shows on hover
+    await (await locate(list_item, "todomvc", "delete_button")).click()
+
+
+async def edit_task(page: Page, old_task, new_task):
+    list_item = await locate(page, "todomvc", "todo_item", task=old_task)
+    await (await locate(list_item, "todomvc", "item_label")).dblclick()  # Double-click to edit
+    input_field = await locate(list_item, "todomvc", "edit_field")
+    await input_field.fill(new_task)
+    await input_field.press("Enter")
+
+
+async def assert_total_items_count(page: Page, expected_count):
+    total_items = await locate(page, "todomvc", "todo_items")
+    await expect(total_items, f"List doesn't have {expected_count} items").to_have_count(expected_count)
+
+
+async def mark_task_as_completed(page: Page, task):
+    list_item = await locate(page, "todomvc", "todo_item", task=task)
+    await (await locate(list_item, "todomvc", "toggle")).check()
+
+
+async def mark_task_as_active(page: Page, task):
+    list_item = await locate(page, "todomvc", "todo_item", task=task)
+    await (await locate(list_item, "todomvc", "toggle")).uncheck()
+
+
+async def clear_completed_tasks(page: Page):
+    await (await locate(page, "todomvc", "clear_completed")).click()
+
+
+async def assert_no_completed_tasks(page: Page):
+    await expect(await locate(page, "todomvc", "completed_items")).to_have_count(0)
+
+
+async def assert_task_not_in_list(page: Page, task):
+    await expect(await locate(page, "todomvc", "todo_list"), f"List contains item {task}").not_to_contain_text(task)
+
+
+async def assert_task_in_list(page: Page, task):
+    await expect(await locate(page, "todomvc", "todo_list"), f"List doesn't contain item {task}").to_contain_text(task)
+
+
+async def filter_tasks_by_status(page: Page, status):
+    await (await locate(page, "todomvc", "filter", status=status)).click()
+
+
+# Async counterpart of test_add_items_to_cart.ShoppingItem, looks the product up in a CatalogIndex
+class ShoppingItem:
+    def __init__(self, name, quantity):
+        self.name = name
+        self.quantity = quantity
+
+    # Returns True when the item ended up in the cart
+    async def add_to_cart(self, page: Page, catalog):
+        product_url = catalog.find(self.name)
+        if product_url is None:
+            print(f"Item {self.name} not found in the catalog.")
+            return False
+        await page.goto(product_url)
+
+        add_to_cart_button = await locate(page, "shop", "add_to_cart")
+        if not (await add_to_cart_button.is_enabled() and await add_to_cart_button.is_visible()):
+            print(f"Item {self.name} not in stock")
+            return False
+
+        increase_quantity_button = await locate(page, "shop", "increase_quantity")
+        for _ in range(self.quantity - 1):
+            await increase_quantity_button.click()
+        await add_to_cart_button.click()
+        if self.name == "Thor Hammer" and self.quantity > 1:
+            await expect(await locate(page, "shop", "thor_hammer_toast")).to_be_visible()
+        else:
+            await expect(await locate(page, "shop", "added_toast")).to_be_visible()
+        return True
@@ -0,0 +1,135 @@
+import argparse
+import asyncio
+import itertools
+import resource
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from playwright.async_api import async_playwright
+
+import async_helpers as todo
+import profiles
+from todomvc_server import app_url, start_server
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    ok: bool
+    seconds: float
+    error: str = ""
+
+
+# Runs every (name, scenario) on one browser, each in its own context, at most `concurrency` at a time.
+# scenario is `async def scenario(page)`
+async def run_scenarios(scenarios, concurrency=8, browser=None):
+    async with async_playwright() as playwright:
+        own_browser = browser is None
+        if own_browser:
+            browser = await playwright.chromium.launch(**profiles.launch_options())
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(name, scenario):
+            async with semaphore:
+                context = await browser.new_context(**profiles.context_options())
+                await profiles.apply_async(context)
+                start = time.perf_counter()
+                try:
+                    await scenario(await context.new_page())
+                    return ScenarioResult(name, True, time.perf_counter() - start)
+                except Exception as error:
+                    return ScenarioResult(name, False, time.perf_counter() - start, str(error).splitlines()[0])
+                finally:
+                    await context.close()
+
+        try:
+            return await asyncio.gather(*(run_one(name, scenario) for name, scenario in scenarios))
+        finally:
+            if own_browser:
+                await browser.close()
+
+
+# The Demo_playwright_tests.py scenarios, bound to the TodoMVC url
+def todomvc_scenarios(url):
+    async def add_tasks(page):
+        await page.goto(url)
+        for task in ["a1", "a2", "a3"]:
+            await todo.add_task(page, task)
+            await todo.assert_task_added(page, task)
+        await todo.assert_total_items_count(page, 3)
+
+    async def filter_active(page):
+        await add_tasks(page)
+        await todo.mark_task_as_completed(page, "a1")
+        await todo.filter_tasks_by_status(page, "Active")
+        await todo.assert_task_not_in_list(page, "a1")
+        await todo.assert_total_items_count(page, 2)
+
+    async def filter_completed(page):
+        await add_tasks(page)
+        await todo.mark_task_as_completed(page, "a1")
+        await todo.filter_tasks_by_status(page, "Completed")
+        await todo.assert_task_in_list(page, "a1")
+        await todo.assert_total_items_count(page, 1)
+
+    async def clear_completed(page):
+        await add_tasks(page)
+        await todo.mark_task_as_completed(page, "a1")
+        await todo.mark_task_as_completed(page, "a2")
+        await todo.clear_completed_tasks(page)
+        await todo.assert_no_completed_tasks(page)
+        await todo.assert_total_items_count(page, 1)
+
+    async def edit(page):
+        await page.goto(url)
+        await todo.add_task(page, "a1")
+        await todo.edit_task(page, "a1", "updated")
+        await todo.assert_task_in_list(page, "updated")
+        await todo.assert_total_items_count(page, 1)
+
+    async def delete(page):
+        await add_tasks(page)
+        await todo.delete_task(page, "a2")
+        await todo.assert_task_not_in_list(page, "a2")
+        await todo.assert_total_items_count(page, 2)
+
+    return [("add_tasks", add_tasks), ("filter_active", filter_active), ("filter_completed", filter_completed),
+            ("clear_completed", clear_completed), ("edit", edit), ("delete", delete)]
+
+
+def cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)  # the browser, counted once it has exited
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the TodoMVC scenarios as concurrent contexts of one browser")
+    parser.add_argument("-n", "--scenarios", type=int, default=60, help="total scenarios to run")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_server()
+    url = app_url(server)
+    scenarios = [(f"{name}#{i}", scenario) for i, (name, scenario)
+                 in zip(range(args.scenarios), itertools.cycle(todomvc_scenarios(url)))]
+
+    cpu_start, start = cpu_seconds(), time.perf_counter()
+    results = asyncio.run(run_scenarios(scenarios, args.concurrency))
+    elapsed, cpu = time.perf_counter() - start, cpu_seconds() - cpu_start
+    server.shutdown()
+    server.server_close()
+
+    failed = [r for r in results if not r.ok]
+    for result in failed:
+        print(f"FAILED {result.name}: {result.error}")
+    print(f"\n{len(results)} scenarios, {len(failed)} failed, concurrency {args.concurrency}")
+    print(f"{elapsed:.1f}s wall, {len(results) / elapsed:.1f} scenarios/s, "
+          f"{len(results) / cpu:.2f} scenarios per CPU second (this process + browser)")
+    print(f"median scenario {statistics.median(r.seconds for r in results):.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+from playwright.sync_api import Browser, Page, TimeoutError as PlaywrightTimeoutError
+
+import profiles
+
+# Saved storage_state snapshots, one file per (site, user)
+AUTH_DIR = os.environ.get("AUTH_CACHE_DIR", ".auth")
+
+# How long a saved session is trusted before logging in again, in seconds
+TTL = int(os.environ.get("AUTH_CACHE_TTL", 30 * 60))
+
+
+def state_path(site, user):
+    slug = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{site}__{user}")
+    return os.path.join(AUTH_DIR, f"{slug}.json")
+
+
+# Path of the cached session, or None if there is none or it is older than ttl
+def load_state(site, user, ttl=TTL):
+    path = state_path(site, user)
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl:
+        return path
+    return None
+
+
+def save_state(context, site, user):
+    os.makedirs(AUTH_DIR, exist_ok=True)
+    context.storage_state(path=state_path(site, user))
+
+
+def invalidate(site, user):
+    path = state_path(site, user)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def is_visible(page: Page, selector, timeout=5000):
+    try:
+        page.locator(selector).wait_for(state="visible", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+# Context of the execution profile, optionally restored from a saved storage_state
+def open_context(browser: Browser, state=None, on_context=None):
+    context = browser.new_context(**{**profiles.context_options(), "storage_state": state})
+    if on_context:
+        on_context(context)
+    return context
+
+
+# Page of a new context that is already logged in: restored from the cache when possible,
+# otherwise (no entry, expired TTL or session rejected by the server) login(page) runs the form.
+# on_context(context) runs before the first navigation, e.g. to set up routing
+@contextmanager
+def logged_in_page(browser: Browser, site, user, url, login, is_logged_in, ttl=TTL, on_context=None):
+    state = load_state(site, user, ttl)
+    context = open_context(browser, state, on_context)
+    try:
+        page = context.new_page()
+        if state:
+            page.goto(url)
+            if not is_logged_in(page):
+                # cookies alone are not enough, the saved localStorage would survive: start from an empty context
+                print(f"\nCached session of {user} on {site} is stale, logging in again")
+                context.close()
+                context = open_context(browser, on_context=on_context)
+                page = context.new_page()
+                state = None
+        if not state:
+            login(page)
+            if not is_logged_in(page):
+                raise AssertionError(f"Login of {user} to {site} failed")
+            save_state(context, site, user)
+        yield page
+    finally:
+        context.close()
@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from run_parallel import SUITE_DIR, node_id, pytest_command, suite_relative
+from summary_stats import summarize
+
+# Tests timed by default; all of them run against local stand-ins (bundled TodoMVC, replayed HAR of the shop)
+DEFAULT_TESTS = [
+    "Demo_playwright_tests.py",
+    "test_add_items_to_cart.py",
+]
+
+# Next to the durations of run_parallel, whichever directory the benchmark is started from
+HISTORY_FILE = os.environ.get("BENCH_HISTORY", os.path.join(SUITE_DIR, ".benchmark_history.json"))
+
+# A test regresses when its median grows by more than this fraction of the baseline median...
+DEFAULT_THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", 0.10))
+# ...and by more than NOISE_MADS median absolute deviations, so a noisy test does not fail the gate on its own
+NOISE_MADS = 3
+
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(["git", *args], capture_output=True, text=True).stdout.strip()
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    if git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+    return commit
+
+
+# One pytest run, returns {test id: seconds} of the tests that passed and the ids of the others
+def run_once(tests, env):
+    with tempfile.TemporaryDirectory() as tmp:
+        junit_file = os.path.join(tmp, "bench.xml")
+        subprocess.run(
+            pytest_command("-q", "-p", "no:cacheprovider", f"--junitxml={junit_file}", *tests),
+            cwd=SUITE_DIR, env=env, capture_output=True, text=True,
+        )
+        if not os.path.exists(junit_file):
+            return {}, []
+        timings, failed = {}, []
+        for testcase in ET.parse(junit_file).getroot().iter("testcase"):
+            if any(testcase.find(tag) is not None for tag in ("failure", "error", "skipped")):
+                failed.append(node_id(testcase))
+            else:
+                timings[node_id(testcase)] = float(testcase.get("time", 0))
+        return timings, failed
+
+
+def run_benchmark(tests, runs, network):
+    env = dict(os.environ, TODOMVC_TARGET="local", HAR_MODE=network)
+    samples, failures = {}, {}
+    for i in range(runs):
+        start = time.perf_counter()
+        timings, failed = run_once(tests, env)
+        for test_id, seconds in timings.items():
+            samples.setdefault(test_id, []).append(seconds)
+        for test_id in failed:
+            failures[test_id] = failures.get(test_id, 0) + 1
+        print(f"Run {i + 1}/{runs}: {len(timings)} tests timed, {len(failed)} not passed, {time.perf_counter() - start:.1f}s")
+    return {test_id: summarize(values) for test_id, values in samples.items()}, failures
+
+
+def load_history():
+    if not os.path.exists(HISTORY_FILE):
+        return {}
+    with open(HISTORY_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(history):
+    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+# Latest stored entry of another commit
+def default_baseline(history, commit):
+    entries = [(entry["timestamp"], key) for key, entry in history.items() if key != commit]
+    return max(entries)[1] if entries else None
+
+
+def is_regression(base, current, threshold):
+    growth = current["median"] - base["median"]
+    noise = NOISE_MADS * max(base["mad"], current["mad"])
+    return growth > base["median"] * threshold and growth > noise
+
+
+# Table of two history entries, returns the ids of the tests that regressed
+def compare(base_name, base, current_name, current, threshold):
+    print(f"\n{'test':60} {base_name[:12]:>12} {current_name[:12]:>12} {'change':>8} {'p95':>8}")
+    regressions = []
+    for test_id in sorted(set(base) | set(current)):
+        if test_id not in base or test_id not in current:
+            side = "baseline" if test_id not in base else current_name
+            print(f"{test_id[:60]:60} {'not in ' + side:>30}")
+            continue
+        old, new = base[test_id], current[test_id]
+        change = (new["median"] - old["median"]) / old["median"] * 100 if old["median"] else 0
+        flag = ""
+        if is_regression(old, new, threshold):
+            regressions.append(test_id)
+            flag = "  REGRESSION"
+        print(f"{test_id[:60]:60} {old['median']:>11.3f}s {new['median']:>11.3f}s {change:>+7.1f}% {new['p95']:>7.3f}s{flag}")
+    return regressions
+
+
+def cmd_run(args):
+    commit = git_commit()
+    results, failures = run_benchmark([suite_relative(test) for test in args.tests] or DEFAULT_TESTS, args.runs, args.network)
+    for test_id, count in sorted(failures.items()):
+        print(f"NOT TIMED {test_id}: did not pass in {count} of {args.runs} runs")
+
+    history = load_history()
+    baseline = args.baseline or default_baseline(history, commit)
+    history[commit] = {"timestamp": time.time(), "runs": args.runs, "network": args.network, "tests": results}
+    save_history(history)
+    print(f"\nResults of {commit} stored in {HISTORY_FILE}")
+
+    if baseline is None:
+        print("No baseline yet, nothing to compare against")
+        return 0
+    if baseline not in history:
+        print(f"Baseline {baseline} is not in {HISTORY_FILE}")
+        return 2
+    regressions = compare(baseline, history[baseline]["tests"], commit, results, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} tests slower than {baseline} by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def cmd_compare(args):
+    history = load_history()
+    for commit in (args.base, args.current):
+        if commit not in history:
+            print(f"{commit} is not in {HISTORY_FILE}, stored: {', '.join(sorted(history)) or 'nothing'}")
+            return 2
+    regressions = compare(args.base, history[args.base]["tests"], args.current, history[args.current]["tests"],
+                          args.threshold)
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Playwright tests and gate on regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed median growth, 0.1 = 10 %%")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the tests N times, store the result and compare with a baseline")
+    run.add_argument("tests", nargs="*", help=f"default: {' '.join(DEFAULT_TESTS)}")
+    run.add_argument("-n", "--runs", type=int, default=5)
+    run.add_argument("--baseline", help="commit to compare with, default: the latest other stored commit")
+    run.add_argument("--network", choices=("replay", "off"), default="replay",
+                     help="replay the recorded HARs (default) or use the live sites")
+    run.set_defaults(func=cmd_run)
+
+    report = commands.add_parser("compare", help="compare two stored commits")
+    report.add_argument("base")
+    report.add_argument("current")
+    report.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import time
+from contextlib import contextmanager
+from playwright.sync_api import Playwright, Browser
+
+import profiles
+from artifacts import watch
+
+
+# One browser process per worker (pytest session / xdist worker), tests only get a fresh context.
+# Headless, slow_mo and Chromium switches come from the execution profile (PW_PROFILE) unless given
+def launch_browser(playwright: Playwright, **launch_options) -> Browser:
+    return playwright.chromium.launch(**{**profiles.launch_options(), **launch_options})
+
+
+# Fresh isolated BrowserContext + page for one test, closed even if the test fails
+@contextmanager
+def new_page(browser: Browser, **context_options):
+    context = browser.new_context(**{**profiles.context_options(), **context_options})
+    profiles.apply(context)
+    try:
+        yield watch(context.new_page())
+    finally:
+        context.close()
+
+
+# Compare per-test overhead: browser launch per test vs context from the pooled browser
+def benchmark(playwright: Playwright, runs=10, url="about:blank"):
+    cold = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        browser = launch_browser(playwright)
+        with new_page(browser) as page:
+            page.goto(url)
+        browser.close()
+        cold.append(time.perf_counter() - start)
+
+    warm = []
+    browser = launch_browser(playwright)
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            with new_page(browser) as page:
+                page.goto(url)
+            warm.append(time.perf_counter() - start)
+    finally:
+        browser.close()
+
+    return cold, warm
+
+
+if __name__ == "__main__":
+    import statistics
+    import sys
+    from playwright.sync_api import sync_playwright
+
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with sync_playwright() as playwright:
+        cold, warm = benchmark(playwright, runs)
+
+    print(f"\nPer-test overhead over {runs} runs:")
+    print(f"  launch per test:  median {statistics.median(cold) * 1000:8.1f} ms, max {max(cold) * 1000:8.1f} ms")
+    print(f"  pooled browser:   median {statistics.median(warm) * 1000:8.1f} ms, max {max(warm) * 1000:8.1f} ms")
+    print(f"  saved per test:   {(statistics.median(cold) - statistics.median(warm)) * 1000:8.1f} ms")
@@ -0,0 +1,66 @@
+SHOP_URL = "https://practicesoftwaretesting.com"
+API_URL = "https://api.practicesoftwaretesting.com/products"
+
+# All product cards of one listing page in a single round-trip: [[name, href], ...]
+PRODUCT_CARDS_JS = """cards => cards.map(card => [
+    card.querySelector('[data-test="product-name"]').textContent.trim(),
+    card.href,
+])"""
+
+
+# Product name -> product page URL, built once so items can be opened directly
+class CatalogIndex:
+    def __init__(self, products):
+        self.products = dict(products)  # keeps catalog order, first substring match = first on the listing
+        self._by_lower_name = {name.lower(): name for name in self.products}
+
+    # Fetch the whole product list from the shop API, one request per API page
+    @classmethod
+    def from_api(cls, request, api_url=API_URL, shop_url=SHOP_URL):
+        products = {}
+        page_number, last_page = 1, 1
+        while page_number <= last_page:
+            response = request.get(api_url, params={"page": page_number})
+            if not response.ok:
+                raise RuntimeError(f"Product API returned {response.status} for page {page_number}")
+            data = response.json()
+            for product in data["data"]:
+                products.setdefault(product["name"], f"{shop_url}/product/{product['id']}")
+            last_page = data.get("last_page", 1)
+            page_number += 1
+        return cls(products)
+
+    # Fallback: walk the pagination once and read all product cards of every page
+    @classmethod
+    def from_pages(cls, page, shop_url=SHOP_URL):
+        page.goto(shop_url)
+        page.locator('a[data-test^="product-"]').first.wait_for()
+        number_of_pages = page.locator('ul.pagination').locator('li.page-item').count() - 2
+        products = {}
+        for page_number in range(1, number_of_pages + 1):
+            if page_number > 1:
+                first_card = page.locator('a[data-test^="product-"]').first.get_attribute("href")
+                page.get_by_role("button", name=f"Page-{page_number}").click()
+                # wait until the listing shows a different set of cards
+                page.wait_for_function(
+                    "href => document.querySelector('a[data-test^=\"product-\"]').getAttribute('href') !== href",
+                    arg=first_card,
+                )
+            for name, href in page.eval_on_selector_all('a[data-test^="product-"]', PRODUCT_CARDS_JS):
+                products.setdefault(name, href)
+        return cls(products)
+
+    def __len__(self):
+        return len(self.products)
+
+    # Exact name first (case-insensitive), otherwise every product containing the name
+    def matches(self, name):
+        exact = self._by_lower_name.get(name.lower())
+        if exact:
+            return [exact]
+        return [product for product in self.products if name.lower() in product.lower()]
+
+    # URL of the best match, the same product the heading search on the listing would hit first
+    def find(self, name):
+        matches = self.matches(name)
+        return self.products[matches[0]] if matches else None
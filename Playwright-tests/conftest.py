@@ -0,0 +1,160 @@
+import os
+import pytest
+from playwright.sync_api import Page, Playwright
+
+import artifacts
+import auth_cache
+import event_stream
+import har_replay
+import instrumentation
+import locators
+import login_matrix
+import profiles
+import waits
+from browser_pool import launch_browser, new_page
+from todomvc_server import REMOTE_URL, app_url, start_server
+
+# "local" serves the bundled TodoMVC copy, "remote" uses demo.playwright.dev
+TODOMVC_TARGET = os.environ.get("TODOMVC_TARGET", "local")
+
+
+# One Chromium per worker for the whole session
+@pytest.fixture(scope="session")
+def shared_browser(playwright: Playwright):
+    browser = launch_browser(playwright)
+    yield browser
+    browser.close()
+
+
+# pytest-playwright's `context`/`page` fixtures open their contexts in the same Chromium instead of launching a second one
+@pytest.fixture(scope="session")
+def browser(shared_browser):
+    return shared_browser
+
+
+# pytest-playwright's own launches and contexts (`page` fixture) follow the execution profile as well
+@pytest.fixture(scope="session")
+def browser_type_launch_args(browser_type_launch_args):
+    return {**browser_type_launch_args, **profiles.launch_options()}
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args):
+    return {**browser_context_args, **profiles.context_options()}
+
+
+# Resource blocking of the profile for tests using the pytest-playwright `page`
+@pytest.fixture(autouse=True)
+def profile_routes(request):
+    if "page" in request.fixturenames:
+        profiles.apply(request.getfixturevalue("context"))
+
+
+# Every test gets its own isolated context, torn down after the test whatever the outcome
+@pytest.fixture
+def fresh_page(shared_browser):
+    with new_page(shared_browser) as page:
+        yield page
+
+
+# URL of the TodoMVC app the demo tests run against
+@pytest.fixture(scope="session")
+def todomvc_url():
+    if TODOMVC_TARGET == "remote":
+        yield REMOTE_URL
+        return
+    server = start_server()
+    yield app_url(server)
+    server.shutdown()
+    server.server_close()
+
+
+# HAR record/replay for tests using the pytest-playwright `page`, see har_replay.HAR_MODE.
+# Modules opt in with pytestmark and define FIRST_PARTY, the domains never treated as third-party
+@pytest.fixture
+def har_network(request):
+    if har_replay.HAR_MODE != "off" and "page" in request.fixturenames:
+        har_replay.attach(request.getfixturevalue("context"), request.node.nodeid, request.module.FIRST_PARTY)
+
+
+# Page with the user of the module's PROFILE (login_matrix.SiteProfile) already logged in, restored from the
+# cached storage_state when possible; runs through HAR record/replay and the profile's resource blocking
+@pytest.fixture
+def logged_in_page(browser, request):
+    site = request.module.PROFILE
+
+    def use_har(context):
+        har_replay.attach(context, request.node.nodeid, site.first_party)
+        profiles.apply(context)
+
+    with auth_cache.logged_in_page(browser, site.name, site.user, site.url,
+                                   lambda page: login_matrix.login(page, site, site.user, site.password),
+                                   lambda page: auth_cache.is_visible(page, site.success), on_context=use_har) as page:
+        yield artifacts.watch(page)
+
+
+# Screenshots, DOM, trace and the step ring buffer are only captured for failed tests, while the pages are still open
+def pytest_runtest_setup(item):
+    artifacts.reset()
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "call" and report.failed:
+        pages = [value for value in item.funcargs.values() if isinstance(value, Page) and value not in artifacts.watched]
+        artifacts.capture_failure(item.nodeid, artifacts.watched + pages)
+
+
+# With PW_INSTRUMENT=1 every test is a top-level span, the helpers it calls are nested inside
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with instrumentation.span(item.nodeid, "test"):
+        yield
+
+
+# PW_EVENTS streams test starts and results while the run goes on, see event_stream
+def pytest_runtest_logstart(nodeid, location):
+    event_stream.emit("test_start", test=nodeid)
+
+
+# One test_finish per test: the call phase, or the setup when it failed or skipped the test
+def pytest_runtest_logreport(report):
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        crash = getattr(report.longrepr, "reprcrash", None)
+        message = crash.message.splitlines()[0] if crash and crash.message else ""
+        event_stream.emit("test_finish", test=report.nodeid, outcome=report.outcome, phase=report.when,
+                          ms=round(report.duration * 1000, 1), **({"message": message} if report.failed else {}))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    event_stream.emit("session_finish", exit_status=int(exitstatus), tests=session.testscollected)
+    event_stream.close()
+
+
+# Summary of fixed sleeps vs event based waits when run with WAITS_INSTRUMENT=1,
+# and of helper timings when run with PW_INSTRUMENT=1
+def pytest_terminal_summary(terminalreporter):
+    lines = waits.report()
+    if lines:
+        terminalreporter.section("fixed sleeps vs readiness waits")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+    for line in profiles.report():
+        terminalreporter.write_line(line)
+
+    lines = locators.health_report()
+    if lines:
+        terminalreporter.section("locator health")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+    lines = instrumentation.summary()
+    if lines:
+        terminalreporter.section("helper timings")
+        for line in lines:
+            terminalreporter.write_line(line)
+        trace = instrumentation.export_trace(artifacts.artifact_path("helper_trace.json"))
+        terminalreporter.write_line(f"Chrome trace written to {trace}")
@@ -0,0 +1,189 @@
+import argparse
+import collections
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from artifacts import worker_id
+from summary_stats import percentile
+
+# PW_EVENTS=events.jsonl appends events to a file, PW_EVENTS=tcp://127.0.0.1:9020 sends them to
+# `python event_stream.py listen`; unset, emit() does nothing
+TARGET = os.environ.get("PW_EVENTS", "")
+ENABLED = bool(TARGET)
+DEFAULT_PORT = 9020
+
+_lock = threading.Lock()
+_sink = None
+
+
+def _open_sink():
+    if TARGET.startswith("tcp://"):
+        host, _, port = TARGET[len("tcp://"):].rpartition(":")
+        sock = socket.create_connection((host or "127.0.0.1", int(port)), timeout=5)
+        return sock.makefile("w", encoding="utf-8", newline="\n")
+    os.makedirs(os.path.dirname(TARGET) or ".", exist_ok=True)
+    return open(TARGET, "a", encoding="utf-8", newline="\n")
+
+
+# One JSON line per event, flushed right away so a reader sees it while the run goes on.
+# A listener that went away switches the stream off instead of failing the tests
+def emit(event, **fields):
+    global _sink, ENABLED
+    if not ENABLED:
+        return
+    line = json.dumps({"event": event, "ts": round(time.time(), 3), "worker": worker_id(), **fields},
+                      ensure_ascii=False, default=str)
+    with _lock:
+        try:
+            if _sink is None:
+                _sink = _open_sink()
+            _sink.write(line + "\n")
+            _sink.flush()
+        except OSError as error:
+            print(f"Event stream {TARGET} not writable ({error}), events switched off", file=sys.stderr)
+            ENABLED = False
+
+
+def close():
+    global _sink
+    with _lock:
+        if _sink is not None:
+            _sink.close()
+            _sink = None
+
+
+# Rolling view of a stream in constant memory: the last `window` test outcomes and durations,
+# the last `window` durations of at most `max_steps` step names (least recently seen dropped)
+class Aggregator:
+    def __init__(self, window=200, max_steps=100):
+        self.window = window
+        self.max_steps = max_steps
+        self.totals = collections.Counter()
+        self.outcomes = collections.deque(maxlen=window)
+        self.test_ms = collections.deque(maxlen=window)
+        self.steps = collections.OrderedDict()  # name -> deque of ms
+        self.step_errors = collections.Counter()
+        self.running = collections.OrderedDict()  # (worker, test) -> start ts
+        self.failures = collections.deque(maxlen=5)
+        self.last_data = {}  # data name -> latest value
+        self.workers = set()
+
+    def add(self, event):
+        kind = event.get("event")
+        self.workers.add(event.get("worker"))
+        if kind == "test_start":
+            self.running[(event.get("worker"), event["test"])] = event["ts"]
+            while len(self.running) > self.window:
+                self.running.popitem(last=False)
+        elif kind == "test_finish":
+            self.running.pop((event.get("worker"), event["test"]), None)
+            self.totals[event["outcome"]] += 1
+            self.outcomes.append(event["outcome"])
+            self.test_ms.append(event["ms"])
+            if event["outcome"] == "failed":
+                self.failures.append(f"{event['test']}: {event.get('message', '')}")
+        elif kind == "step" and event.get("category") != "test":
+            durations = self.steps.pop(event["name"], None) or collections.deque(maxlen=self.window)
+            durations.append(event["ms"])
+            self.steps[event["name"]] = durations
+            if len(self.steps) > self.max_steps:
+                self.steps.popitem(last=False)
+            if not event.get("ok", True):
+                self.step_errors[event["name"]] += 1
+        elif kind == "data" and (len(self.last_data) < self.max_steps or event["name"] in self.last_data):
+            self.last_data[event["name"]] = event.get("value")
+
+    def pass_rate(self):
+        finished = [outcome for outcome in self.outcomes if outcome != "skipped"]
+        return sum(outcome == "passed" for outcome in finished) / len(finished) if finished else None
+
+    def status(self, slowest=5):
+        rate = self.pass_rate()
+        lines = [f"{sum(self.totals.values())} tests finished ({', '.join(f'{n} {k}' for k, n in sorted(self.totals.items()))}), "
+                 f"{len(self.running)} running on {len(self.workers)} worker(s)"]
+        if rate is not None:
+            lines.append(f"pass rate of the last {len(self.outcomes)}: {rate:.0%}")
+        if self.test_ms:
+            lines.append(f"test duration p50 {percentile(self.test_ms, 50):.0f} ms, p95 {percentile(self.test_ms, 95):.0f} ms")
+        by_p95 = sorted(self.steps.items(), key=lambda item: -percentile(item[1], 95))[:slowest]
+        for name, durations in by_p95:
+            errors = f", {self.step_errors[name]} failed" if self.step_errors[name] else ""
+            lines.append(f"  {name[:40]:40} n={len(durations):<4} p50 {percentile(durations, 50):>7.0f} ms  "
+                         f"p95 {percentile(durations, 95):>7.0f} ms{errors}")
+        for failure in self.failures:
+            lines.append(f"  FAILED {failure[:150]}")
+        for name, value in list(self.last_data.items())[-3:]:
+            lines.append(f"  {name}: {json.dumps(value, ensure_ascii=False)[:150]}")
+        return lines
+
+
+def feed(aggregator, lines, lock):
+    for line in lines:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        with lock:
+            aggregator.add(event)
+
+
+def report_every(aggregator, lock, seconds, stop):
+    while not stop.wait(seconds):
+        with lock:
+            lines = aggregator.status()
+        print(f"--- {time.strftime('%H:%M:%S')}\n" + "\n".join(lines), flush=True)
+
+
+# Reads a JSONL file as it grows, like tail -f
+def follow(path, stop):
+    partial = ""
+    with open(path, encoding="utf-8") as f:
+        while not stop.is_set():
+            partial += f.readline()
+            if partial.endswith("\n"):
+                yield partial
+                partial = ""
+            else:
+                time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live pass rate and latency of a test run from its event stream")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listen = commands.add_parser("listen", help="accept events from PW_EVENTS=tcp://host:port")
+    listen.add_argument("--host", default="127.0.0.1")
+    listen.add_argument("--port", type=int, default=DEFAULT_PORT)
+    tail = commands.add_parser("follow", help="read a PW_EVENTS=<file> stream while it is written")
+    tail.add_argument("path")
+    for command in (listen, tail):
+        command.add_argument("--every", type=float, default=5.0, help="seconds between two status reports")
+        command.add_argument("--window", type=int, default=200, help="tests and step calls the rolling stats cover")
+    args = parser.parse_args()
+
+    aggregator, lock, stop = Aggregator(args.window), threading.Lock(), threading.Event()
+    threading.Thread(target=report_every, args=(aggregator, lock, args.every, stop), daemon=True).start()
+    try:
+        if args.command == "listen":
+            class Handler(socketserver.StreamRequestHandler):
+                def handle(self):
+                    feed(aggregator, (line.decode("utf-8", "replace") for line in self.rfile), lock)
+
+            with socketserver.ThreadingTCPServer((args.host, args.port), Handler) as server:
+                print(f"Listening on tcp://{args.host}:{args.port}", flush=True)
+                server.serve_forever()
+        else:
+            feed(aggregator, follow(args.path, stop), lock)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        print("\n".join(aggregator.status()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import glob
+import json
+import os
+import re
+from urllib.parse import urlparse
+
+from artifacts import worker_id
+
+# off: live network, record: save a HAR per test, replay: serve the saved HAR instead of the network
+HAR_MODE = os.environ.get("HAR_MODE", "off")
+HAR_DIR = os.environ.get("HAR_DIR", "hars")
+
+# HAR_STRIP=image,font drops these resource types completely in replay mode
+STRIP_TYPES = set(filter(None, os.environ.get("HAR_STRIP", "").split(",")))
+
+# One report per worker, parallel shards never write the same file; print_report() merges them
+REPORT_PATTERN = os.path.join(HAR_DIR, "replay_report-*.json")
+
+
+def report_file():
+    return os.path.join(HAR_DIR, f"replay_report-{worker_id()}.json")
+
+
+def har_path(test_id):
+    return os.path.join(HAR_DIR, re.sub(r"[^A-Za-z0-9_.-]", "_", test_id) + ".har")
+
+
+def is_first_party(url, first_party):
+    host = urlparse(url).hostname or ""
+    return any(host == domain or host.endswith("." + domain) for domain in first_party)
+
+
+# url -> recorded response size, from the HAR saved in record mode
+def recorded_sizes(path):
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)["log"]["entries"]
+    sizes = {}
+    for entry in entries:
+        content = entry["response"].get("content", {})
+        sizes[entry["request"]["url"]] = max(content.get("size", 0), entry["response"].get("bodySize", 0), 0)
+    return sizes
+
+
+class ReplayStats:
+    def __init__(self, test_id, sizes):
+        self.test_id = test_id
+        self.sizes = sizes
+        self.served = 0
+        self.served_bytes = 0
+        self.missed = 0
+        self.blocked = 0
+        self.stripped = 0
+        self.blocked_bytes = 0
+
+    def as_dict(self):
+        return {
+            "recorded_requests": len(self.sizes),
+            "recorded_bytes": sum(self.sizes.values()),
+            "served_from_har": self.served,
+            "missing_from_har": self.missed,
+            "blocked_third_party": self.blocked,
+            "stripped_media": self.stripped,
+            "stripped_or_blocked_bytes": self.blocked_bytes,
+            "network_requests_saved": self.served + self.blocked + self.stripped,
+            # recorded sizes of the requests this run made and did not send over the network
+            "network_bytes_saved": self.served_bytes + self.blocked_bytes,
+        }
+
+
+def save_report(stats):
+    path = report_file()
+    report = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+    report[stats.test_id] = stats.as_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+# test id -> row, of all workers; a test replayed by several workers keeps the row of the latest file
+def load_report():
+    report = {}
+    for path in sorted(glob.glob(REPORT_PATTERN), key=os.path.getmtime):
+        with open(path, encoding="utf-8") as f:
+            report.update(json.load(f))
+    return report
+
+
+# Hooks the context up according to HAR_MODE, must be called before the first page.goto()
+def attach(context, test_id, first_party):
+    path = har_path(test_id)
+    if HAR_MODE == "record":
+        os.makedirs(HAR_DIR, exist_ok=True)
+        # the HAR is written when the context closes
+        context.route_from_har(path, update=True)
+        return None
+    if HAR_MODE != "replay":
+        return None
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No recorded HAR for {test_id}, run it once with HAR_MODE=record")
+
+    stats = ReplayStats(test_id, recorded_sizes(path))
+    context.route_from_har(path, not_found="abort")
+
+    # Registered after route_from_har, so it sees every request first
+    def filter_request(route):
+        request = route.request
+        if request.resource_type in STRIP_TYPES:
+            stats.stripped += 1
+            stats.blocked_bytes += stats.sizes.get(request.url, 0)
+            route.abort()
+        elif request.url in stats.sizes:
+            stats.served += 1
+            stats.served_bytes += stats.sizes[request.url]
+            route.fallback()
+        elif is_first_party(request.url, first_party):
+            # not recorded, route_from_har aborts it
+            stats.missed += 1
+            route.fallback()
+        else:
+            stats.blocked += 1
+            route.abort()
+
+    context.route("**/*", filter_request)
+    context.on("close", lambda _: save_report(stats))
+    return stats
+
+
+def print_report():
+    report = load_report()
+    if not report:
+        print("No replay report yet, run the tests with HAR_MODE=replay")
+        return
+    print(f"{'test':60} {'live req':>8} {'live kB':>9} {'saved req':>9} {'saved kB':>9} {'stripped kB':>11} {'not in HAR':>10}")
+    for test_id, row in sorted(report.items()):
+        print(f"{test_id:60} {row['recorded_requests']:>8} {row['recorded_bytes'] / 1024:>9.1f} "
+              f"{row['network_requests_saved']:>9} {row['network_bytes_saved'] / 1024:>9.1f} "
+              f"{row['stripped_or_blocked_bytes'] / 1024:>11.1f} {row.get('missing_from_har', 0):>10}")
+
+
+if __name__ == "__main__":
+    print_report()
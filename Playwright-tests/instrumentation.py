@@ -0,0 +1,148 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import event_stream
+
+# PW_INSTRUMENT=1 records every instrumented helper call; when off, @timed returns the function untouched
+ENABLED = os.environ.get("PW_INSTRUMENT") == "1"
+# Calls are also timed when they only go to the event stream (PW_EVENTS), without being kept in `spans`
+ACTIVE = ENABLED or event_stream.ENABLED
+
+# Protocol commands that load a new document
+NAVIGATION_METHODS = {"goto", "reload", "goBack", "goForward"}
+
+spans = []  # finished calls, in the order they ended
+_local = threading.local()
+_installed = False
+
+
+class Span:
+    def __init__(self, name, category):
+        self.name = name
+        self.category = category
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+        self.round_trips = 0
+        self.navigations = 0
+        self.depth = 0
+
+    @property
+    def duration_ms(self):
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+def _active():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+# Every message sent to the Playwright driver is a round-trip; it is counted on all open spans
+def install():
+    global _installed
+    if _installed:
+        return
+    from playwright._impl._connection import Channel
+
+    original_send = Channel.send
+
+    async def send(self, method, *args, **kwargs):
+        for span in _active():
+            span.round_trips += 1
+            if method in NAVIGATION_METHODS:
+                span.navigations += 1
+        return await original_send(self, method, *args, **kwargs)
+
+    Channel.send = send
+    _installed = True
+
+
+@contextmanager
+def _record(name, category):
+    stack = _active()
+    span = Span(name, category)
+    span.depth = len(stack)
+    stack.append(span)
+    error = None
+    try:
+        yield span
+    except BaseException as raised:
+        error = f"{type(raised).__name__}: {str(raised).splitlines()[0] if str(raised) else ''}"
+        raise
+    finally:
+        span.end_ns = time.perf_counter_ns()
+        stack.pop()
+        if ENABLED:
+            spans.append(span)
+        event_stream.emit("step", name=name, category=category, ms=round(span.duration_ms, 1), depth=span.depth,
+                          round_trips=span.round_trips, ok=error is None, **({"error": error} if error else {}))
+
+
+# with span("checkout"): ... - records a block the same way @timed records a call
+def span(name, category="block"):
+    if not ACTIVE:
+        return nullcontext()
+    install()
+    return _record(name, category)
+
+
+def timed(func):
+    if not ACTIVE:
+        return func
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        install()
+        with _record(name, "helper"):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+# Chrome trace-event JSON, open in chrome://tracing or https://ui.perfetto.dev
+def export_trace(path):
+    if not spans:
+        return None
+    origin = min(s.start_ns for s in spans)
+    pid = os.getpid()
+    events = [{
+        "name": s.name,
+        "cat": s.category,
+        "ph": "X",
+        "ts": (s.start_ns - origin) / 1000,
+        "dur": (s.end_ns - s.start_ns) / 1000,
+        "pid": pid,
+        "tid": 0,
+        "args": {"round_trips": s.round_trips, "navigations": s.navigations},
+    } for s in sorted(spans, key=lambda s: (s.start_ns, s.depth))]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
+
+
+# One line per helper, sorted by total time; times include nested helpers
+def summary(category="helper"):
+    rows = {}
+    for s in spans:
+        if s.category != category:
+            continue
+        row = rows.setdefault(s.name, {"calls": 0, "total_ms": 0.0, "round_trips": 0, "navigations": 0})
+        row["calls"] += 1
+        row["total_ms"] += s.duration_ms
+        row["round_trips"] += s.round_trips
+        row["navigations"] += s.navigations
+    if not rows:
+        return []
+    suite_ms = sum(s.duration_ms for s in spans if s.depth == 0)
+    lines = [f"{'helper':40} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'% suite':>8} {'round-trips':>12} {'navigations':>12}"]
+    for name, row in sorted(rows.items(), key=lambda item: -item[1]["total_ms"]):
+        share = row["total_ms"] / suite_ms * 100 if suite_ms else 0
+        lines.append(f"{name[:40]:40} {row['calls']:>6} {row['total_ms']:>10.1f} {row['total_ms'] / row['calls']:>9.1f} "
+                     f"{share:>8.1f} {row['round_trips']:>12} {row['navigations']:>12}")
+    return lines
@@ -0,0 +1,140 @@
+import os
+import re
+import time
+
+from login_matrix import PROFILES
+
+# LOCATOR_HEALTH=1 counts the matches of every looked up locator and times it; off, locate() is a dict lookup
+HEALTH = os.environ.get("LOCATOR_HEALTH") == "1"
+SLOW_MS = float(os.environ.get("LOCATOR_SLOW_MS", 100))
+
+# Every selector of the suites, named once per site. A value is a selector string (may contain {placeholders})
+# or a function scope, **params -> Locator for chains like get_by_role(...).filter(...). The scope is the page,
+# or a locator for parts of an element (the toggle of a todo item)
+REGISTRY = {
+    "todomvc": {
+        "new_todo": lambda page: page.get_by_role("textbox", name="What needs to be done?"),
+        "todo_item": lambda page, task: page.get_by_role("listitem").filter(has_text=task),
+        "todo_list": "ul.todo-list",
+        "todo_items": "ul.todo-list > li",
+        "completed_items": "ul.todo-list > li.completed",
+        "clear_completed": lambda page: page.get_by_role("button", name="Clear completed"),
+        "filter": lambda page, status: page.get_by_role("link", name=status),
+        "filters": "ul.filters > li > a",
+        # inside a todo_item
+        "toggle": "[aria-label='Toggle Todo']",
+        "delete_button": "button.destroy",
+        "item_label": "label",
+        "edit_field": "input.edit",
+    },
+    "shop": {
+        "add_to_cart": lambda page: page.get_by_role("button", name="Add to cart"),
+        "increase_quantity": lambda page: page.get_by_role("button", name="Increase quantity"),
+        "added_toast": "[aria-label='Product added to shopping cart.']",
+        "thor_hammer_toast": "[aria-label='You can only have one Thor Hammer in the cart.']",
+        "cart_icon": 'a[data-test="nav-cart"][aria-label="cart"]',
+        "cart_rows": "tbody tr",
+        "product_card": 'a[data-test^="product-"]',
+    },
+    "kitner": {
+        "logout": '[data-test="logout_button"]',
+        "login_link": '[data-test="login_link"]',
+    },
+    "najada": {
+        "logout": '[class="icon icon_logout"]',
+    },
+}
+
+# Form fields, success and error messages of the login sites come from their profiles
+for _site in PROFILES.values():
+    REGISTRY.setdefault(_site.name, {}).update({
+        "user_field": _site.user_field,
+        "password_field": _site.password_field,
+        "submit": _site.submit,
+        **({"success": _site.success} if _site.success else {}),
+        **({"open_form": _site.open_form} if _site.open_form else {}),
+        **{f"error_{key}": selector for key, selector in _site.errors.items()},
+    })
+
+# Names that are meant to match several elements, anything else matching more than one is ambiguous
+MULTIPLE = {("todomvc", "todo_items"), ("todomvc", "completed_items"), ("todomvc", "filters"), ("shop", "cart_rows"),
+            ("shop", "product_card")}
+
+# (site, name) -> {"uses", "total_ms", "max_ms", "max_matches", "zero_matches"}
+stats = {}
+
+
+def build(scope, site, name, **params):
+    entry = REGISTRY[site][name]
+    return entry(scope, **params) if callable(entry) else scope.locator(entry.format(**params))
+
+
+def locate(scope, site, name, **params):
+    locator = build(scope, site, name, **params)
+    if HEALTH:
+        start = time.perf_counter()
+        matches = locator.count()
+        record(site, name, (time.perf_counter() - start) * 1000, matches)
+    return locator
+
+
+# locate() for playwright.async_api pages, see async_helpers
+async def locate_async(scope, site, name, **params):
+    locator = build(scope, site, name, **params)
+    if HEALTH:
+        start = time.perf_counter()
+        matches = await locator.count()
+        record(site, name, (time.perf_counter() - start) * 1000, matches)
+    return locator
+
+
+def record(site, name, elapsed_ms, matches):
+    row = stats.setdefault((site, name), {"uses": 0, "total_ms": 0.0, "max_ms": 0.0, "max_matches": 0, "zero_matches": 0})
+    row["uses"] += 1
+    row["total_ms"] += elapsed_ms
+    row["max_ms"] = max(row["max_ms"], elapsed_ms)
+    row["max_matches"] = max(row["max_matches"], matches)
+    row["zero_matches"] += matches == 0
+
+
+# Selectors that break with unrelated markup changes: exact class lists, positions, long chains
+def brittleness(selector):
+    if callable(selector):
+        return None
+    if re.search(r'\[class="[^"]*\s[^"]*\s[^"]*"\]', selector):
+        return "exact class list"
+    if re.search(r":nth-(child|of-type)|\bnth=", selector) or re.match(r"^(//|xpath=)", selector):
+        return "position based"
+    bare = re.sub(r"\[[^\]]*\]|\"[^\"]*\"|'[^']*'", "", selector).strip()
+    if not bare.startswith("text=") and len(re.findall(r"\s*[> ]\s*(?=[\w.#\[])", bare)) > 4:
+        return "long chain"
+    return None
+
+
+def health_report():
+    if not HEALTH:
+        return []
+    lines = []
+    names = sorted({key for key in stats} | {(site, name) for site, entries in REGISTRY.items() for name in entries
+                                             if brittleness(entries[name])})
+    for site, name in names:
+        row = stats.get((site, name))
+        flags = []
+        if row and row["max_ms"] > SLOW_MS:
+            flags.append("slow")
+        if row and row["max_matches"] > 1 and (site, name) not in MULTIPLE:
+            flags.append(f"ambiguous ({row['max_matches']} matches)")
+        if row and row["zero_matches"] == row["uses"]:
+            flags.append("never matched")
+        issue = brittleness(REGISTRY[site][name])
+        if issue:
+            flags.append(issue)
+        if row is None:
+            lines.append(f"{site + '.' + name:40} {'not used':>30}  {', '.join(flags)}")
+        else:
+            mean = row["total_ms"] / row["uses"]
+            lines.append(f"{site + '.' + name:40} {row['uses']:>6} {mean:>8.1f} {row['max_ms']:>8.1f} {row['max_matches']:>6}  "
+                         f"{', '.join(flags)}")
+    if lines:
+        lines.insert(0, f"{'locator':40} {'uses':>6} {'mean ms':>8} {'max ms':>8} {'max n':>6}  flags")
+    return lines
@@ -0,0 +1,164 @@
+from dataclasses import dataclass, field
+from playwright.sync_api import Page, expect
+
+from instrumentation import timed
+from waits import instead_of_sleep, wait_for_network_idle
+
+
+# Everything a login test needs to know about one site
+@dataclass
+class SiteProfile:
+    name: str
+    url: str
+    first_party: tuple  # domains of the site itself, see har_replay
+    user_field: str
+    password_field: str
+    submit: str
+    errors: dict  # error key -> locator of the message
+    success: str = None  # visible once logged in
+    open_form: str = None  # clicked to show the login form, if it is not on the page right away
+    settle: bool = False  # the page loads its scripts after "load", wait for the network to go idle
+    user: str = None  # working account, None if the site has none
+    password: str = None
+    unknown_user: str = "neexistujici.uzivatel@seznam.cz"
+    matrix: dict = field(default_factory=dict)  # credential class -> error keys that must show up
+
+
+# Credential classes: name -> (user, password) for a given site profile
+CREDENTIALS = {
+    "unknown_user": lambda site: (site.unknown_user, site.password),
+    "unknown_user_short_password": lambda site: (site.unknown_user, "chyba"),
+    "wrong_password": lambda site: (site.user, "123456798"),
+    "short_password": lambda site: (site.user, "chyba"),
+    "no_user": lambda site: ("", site.password),
+    "no_password": lambda site: (site.user, ""),
+    "no_user_no_password": lambda site: ("", ""),
+}
+
+PROFILES = {
+    "kitner": SiteProfile(
+        name="kitner",
+        url="http://testovani.kitner.cz/login",
+        first_party=("kitner.cz",),
+        user_field='[data-test="email_input"]',
+        password_field='[data-test="password_input"]',
+        submit='[data-test="login_button"]',
+        success='[data-test="courses_title"]',
+        errors={"email": '[data-test="email_input_errors"]', "password": '[data-test="password_input_errors"]'},
+        user="hinanoc939@naobk.com",
+        password="Alextajne123",
+        unknown_user="anoc939@naobk.com",
+        matrix={
+            "unknown_user": ("email",),
+            "no_user": ("email",),
+            "wrong_password": ("email",),
+            "no_password": ("password",),
+            "no_user_no_password": ("email", "password"),
+        },
+    ),
+    "najada": SiteProfile(
+        name="najada",
+        url="https://www.najada.games/",
+        first_party=("najada.games",),
+        open_form=".loginAction",
+        settle=True,
+        user_field="#email",
+        password_field="#password",
+        submit='[type="submit"]',
+        success='a[class="UserStateReview__name font-encodeCond text-left line-1"]',
+        errors={"validation": ".validation-message", "credentials": 'p[class="red error-message"]'},
+        user="Test_account",
+        password="Heslotajne123",
+        matrix={
+            "short_password": ("validation",),
+            "wrong_password": ("credentials",),
+        },
+    ),
+    "rohlik": SiteProfile(
+        name="rohlik",
+        url="https://www.rohlik.cz/",
+        first_party=("rohlik.cz",),
+        open_form='[data-test="IconUserLogin"]',
+        settle=True,
+        user_field="#email",
+        password_field="#password",
+        submit='[data-test="btnSignIn"]',
+        errors={
+            "credentials": 'span[data-test="notification-content" ]',
+            "email": "text=Email je povinný",
+            "password": "text=Heslo je povinné",
+        },
+        unknown_user="123@seznam.cz",
+        matrix={
+            "unknown_user_short_password": ("credentials",),
+            "no_user_no_password": ("email", "password"),
+        },
+    ),
+}
+
+
+# One parametrized case of the matrix
+@dataclass
+class LoginCase:
+    site: SiteProfile
+    credentials: str
+    user: str
+    password: str
+    expected_errors: tuple
+
+    @property
+    def id(self):
+        return f"{self.site.name}-{self.credentials}"
+
+
+def expand(profiles=PROFILES):
+    cases = []
+    for site in profiles.values():
+        for credentials, expected_errors in site.matrix.items():
+            user, password = CREDENTIALS[credentials](site)
+            cases.append(LoginCase(site, credentials, user, password, expected_errors))
+    return cases
+
+
+@timed
+def open_login_form(page: Page, site: SiteProfile):
+    page.goto(site.url)
+    page.wait_for_load_state('load')
+    if site.settle:
+        # give the scripts loaded after "load" time to settle, at most as long as the old fixed 3 s sleep:
+        # rohlik and najada keep trackers and long-polling going, so the network may never go idle
+        instead_of_sleep(3000, f"{site.name} login page", lambda: wait_for_network_idle(page, 3000, required=False))
+    # what the next step needs: the login trigger, or the form itself (click/fill then wait until it is enabled)
+    ready = page.locator(site.open_form or site.user_field)
+    ready.wait_for(state="visible")
+    if site.open_form:
+        ready.click()
+
+
+# The form can be filled again without navigating while it is still on the page and editable
+def form_reusable(page: Page, site: SiteProfile):
+    field = page.locator(site.password_field)
+    return field.is_visible() and field.is_editable()
+
+
+# Clears the fields of the previous case and waits for its error messages to go away, so they cannot make
+# the next case's check pass on their own. False when one stays, the form is then loaded again
+def reset_form(page: Page, site: SiteProfile, timeout=2000):
+    page.locator(site.user_field).fill("")
+    page.locator(site.password_field).fill("")
+    try:
+        for selector in site.errors.values():
+            expect(page.locator(f"{selector} >> visible=true")).to_have_count(0, timeout=timeout)
+    except AssertionError:
+        return False
+    return True
+
+
+@timed
+def login(page: Page, site: SiteProfile, user, password, reuse=False):
+    print(f"\nZkouším přihlásit uživatele. Email: {user}, Heslo: {password}")
+    if not (reuse and form_reusable(page, site) and reset_form(page, site)):
+        open_login_form(page, site)
+    page.locator(site.user_field).fill(user)
+    page.locator(site.password_field).fill(password)
+    page.click(site.submit)
@@ -1,85 +1,42 @@
 import re
+import pytest
 from playwright.sync_api import sync_playwright, Page, expect
 
-URL="http://testovani.kitner.cz/login"
+import auth_cache
+import login_matrix
+from locators import locate
 
-# Cílem úkolu je doplnit funkci LOGIN, tak aby všechny testy prošly
-def login(page: Page, email, password):
-    print(f"\nZkouším přihlásit uživatele. Email: {email}, Heslo: {password}")
-
-    # prohlížeč je otevřený přes page, není jej tedy třeba otevírat
-    # otevřít stránku saucedemo.com, adresa je v proměnné URL
-    page.goto(URL)
-
-    # ověřit že se stránka otevřela
-    page.wait_for_load_state('load')
+# Site under test, the conftest logged_in_page fixture reads it as well
+PROFILE = login_matrix.PROFILES["kitner"]
+URL = PROFILE.url
 
-    #fill user data and click login button
-    page.locator('[data-test="email_input"]').fill(email)
-    page.locator('[data-test="password_input"]').fill(password)
-    page.click('[data-test="login_button"]')
-
-def logout(page: Page):
-    try:
-        page.click('[data-test="logout_button"]')
-    except TimeoutError:
-        print("Error: Logout button not visible.")
+# Domains of the site itself, anything else not in the recorded HAR is blocked in replay mode
+FIRST_PARTY = PROFILE.first_party
 
-def test_bad_email_ok_password(page: Page):
-    login(page, "hinanoc939@naobk.com", "Alextajne123")
-    try:
-        expect(page.locator('[data-test="email_input_errors"]')).to_be_visible()
-    except AssertionError:
-        print("Error: Error messages not visible")
+pytestmark = pytest.mark.usefixtures("har_network")
 
-def test_no_email_ok_password(page: Page):
-    login(page, "", "Alextajne123")
-    try:
-        expect(page.locator('[data-test="email_input_errors"]')).to_be_visible()
-    except AssertionError:
-        print("Error: Error messages not visible")
+SITE = PROFILE.name
+USER = PROFILE.user
+PASSWORD = PROFILE.password
 
-def test_ok_email_bad_password(page: Page):
-    login(page, "anoc939@naobk.com", "extajne123")
-    try:
-        expect(page.locator('[data-test="email_input_errors"]')).to_be_visible()
-    except AssertionError:
-        print("Error: Error messages not visible")
-
-def test_ok_email_no_password(page: Page):
-    login(page, "hinanoc939@naobk.com", "")
-    try:
-        expect(page.locator('[data-test="password_input_errors"]')).to_be_visible()
-    except AssertionError:
-        print("Error: Error message not visible")
+# Wrong and missing credentials are covered by test_login_matrix.py
+def login(page: Page, email, password):
+    login_matrix.login(page, PROFILE, email, password)
 
-def test_no_email_no_password(page: Page):
-    login(page, "", "")
-    try:
-        expect(page.locator('[data-test="email_input_errors"]')).to_be_visible()
-        expect(page.locator('[data-test="password_input_errors"]')).to_be_visible()
-    except AssertionError:
-        print("Error: Error messages not visible")
+def logout(page: Page):
+    locate(page, SITE, "logout").click()
 
 def test_login_success(page: Page):
-    login(page, "hinanoc939@naobk.com", "Alextajne123")
-    try:
-        expect(page.locator('[data-test="courses_title"]')).to_be_visible()
-    except AssertionError:
-        print("Error: User not logged in")
-    page.screenshot(path="screenshot_login_success_kitner.png")
+    login(page, USER, PASSWORD)
+    expect(locate(page, SITE, "success"), "User not logged in").to_be_visible()
+    # the form worked, keep the session for tests that only need to be logged in
+    auth_cache.save_state(page.context, SITE, USER)
 
-def test_logout_success(page: Page):
-    login(page, "hinanoc939@naobk.com", "Alextajne123")
+def test_logout_success(logged_in_page: Page):
+    page = logged_in_page
 
-    try:
-        expect(page.locator('[data-test="courses_title"]')).to_be_visible()
-    except AssertionError:
-        print("Error: User not logged in.")
+    expect(locate(page, SITE, "success"), "User not logged in").to_be_visible()
     logout(page)
-    try:
-        expect(page.locator('[data-test="login_link"]')).to_be_visible()
-    except AssertionError:
-        print("Error: User not logged out.")
-
-    page.screenshot(path="screenshot_logout_success_kitner.png")
+    # logging out ends the session on the server, the cached one is no longer valid
+    auth_cache.invalidate(SITE, USER)
+    expect(locate(page, SITE, "login_link"), "User not logged out").to_be_visible()
@@ -1,62 +1,41 @@
 import re
+import pytest
 from playwright.sync_api import sync_playwright, Page, expect
 
-URL = "https://www.najada.games/"
+import auth_cache
+import login_matrix
+from locators import locate
 
-# Cílem úkolu je doplnit funkci LOGIN, tak aby všechny testy prošly
+# Site under test, the conftest logged_in_page fixture reads it as well
+PROFILE = login_matrix.PROFILES["najada"]
+URL = PROFILE.url
+
+# Domains of the site itself, anything else not in the recorded HAR is blocked in replay mode
+FIRST_PARTY = PROFILE.first_party
+
+pytestmark = pytest.mark.usefixtures("har_network")
+
+SITE = PROFILE.name
+USER = PROFILE.user
+PASSWORD = PROFILE.password
+
+# Wrong and missing credentials are covered by test_login_matrix.py
 def login(page: Page, user, password):
-    print(f"\nZkouším přihlásit uživatele. Email: {user}, Heslo: {password}")
-
-    # prohlížeč je otevřený přes page, není jej tedy třeba otevírat
-    # otevřít stránku saucedemo.com, adresa je v proměnné URL
-    page.goto(URL)
-
-    # ověřit že se stránka otevřela
-    page.wait_for_load_state('load')
-    page.wait_for_timeout(3000)
-
-    page.click(".loginAction")
-    page.locator("#email").fill(user)
-    page.locator("#password").fill(password)
-    page.click('[type="submit"]')
-
-def test_bad_user_short_password(page: Page):
-    login(page, "Test_account", "chyba")
-    try:
-        expect(page.locator(".validation-message")).to_be_visible()
-    except AssertionError:
-        print("Error: Error message not visible")
-
-def test_bad_password(page: Page):
-    login(page, "Test_account", "123456798")
-    try:
-     expect(page.locator('p[class="red error-message"]')).to_be_visible()
-    except AssertionError:
-        print("Error: Error message not visible")
+    login_matrix.login(page, PROFILE, user, password)
 
 def test_login_success(page: Page):
-    login(page, "Test_account", "Heslotajne123")
-    try:
-        expect(page.locator('a[class="UserStateReview__name font-encodeCond text-left line-1"]')).to_be_visible()
-    except AssertionError:
-        print("Error: User not logged in")
-    page.screenshot(path="screenshot_login_success_najada.png")
-
-def test_logout(page: Page):
-    login(page, "Test_account", "Heslotajne123")
-
-    try:
-        expect(page.locator('a[class="UserStateReview__name font-encodeCond text-left line-1"]')).to_be_visible()
-    except AssertionError:
-        print("Error: User not logged in")
-
-    try:
-        page.click('[class="icon icon_logout"]')
-    except TimeoutError:
-        print("Error: Logout button not visible or clickable.")
-
-    try:
-        expect(page.locator('.loginAction')).to_be_visible()
-    except AssertionError:
-        print("Error: Login button not visible after logging out.")
-    page.screenshot(path="screenshot_logout_success_najada.png")
+    login(page, USER, PASSWORD)
+    expect(locate(page, SITE, "success"), "User not logged in").to_be_visible()
+    # the form worked, keep the session for tests that only need to be logged in
+    auth_cache.save_state(page.context, SITE, USER)
+
+def test_logout(logged_in_page: Page):
+    page = logged_in_page
+
+    expect(locate(page, SITE, "success"), "User not logged in").to_be_visible()
+
+    locate(page, SITE, "logout").click()
+    # logging out ends the session on the server, the cached one is no longer valid
+    auth_cache.invalidate(SITE, USER)
+
+    expect(locate(page, SITE, "open_form"), "Login button not visible after logging out").to_be_visible()
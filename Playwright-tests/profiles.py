@@ -0,0 +1,166 @@
+import argparse
+import os
+import statistics
+import sys
+from dataclasses import dataclass, field
+
+# Execution profile of the whole run: debug (headed, slowed down), ci (headless, default) or perf
+PROFILE = os.environ.get("PW_PROFILE", "ci")
+
+# Stops CSS animations/transitions and smooth scrolling in every document of a context
+NO_ANIMATIONS_JS = """
+(() => {
+    const css = `*, *::before, *::after {
+        animation: none !important; transition: none !important;
+        scroll-behavior: auto !important; caret-color: transparent !important;
+    }`;
+    const add = () => {
+        const style = document.createElement("style");
+        style.textContent = css;
+        document.documentElement.appendChild(style);
+    };
+    if (document.documentElement) add(); else document.addEventListener("DOMContentLoaded", add);
+})();
+"""
+
+
+@dataclass
+class ExecutionProfile:
+    name: str
+    headless: bool = True
+    slow_mo: int = 0
+    viewport: dict = field(default_factory=lambda: {"width": 1280, "height": 720})
+    block: frozenset = frozenset()  # resource types aborted by route interception: image, font, media
+    disable_animations: bool = False
+    args: tuple = ()  # extra Chromium command line switches
+
+
+PROFILES = {
+    "debug": ExecutionProfile("debug", headless=False, slow_mo=500, viewport={"width": 1440, "height": 900}),
+    "ci": ExecutionProfile("ci"),
+    "perf": ExecutionProfile(
+        "perf",
+        block=frozenset({"image", "font", "media"}),
+        disable_animations=True,
+        args=("--disable-gpu", "--disable-smooth-scrolling", "--disable-extensions"),
+    ),
+}
+
+# resource type -> requests aborted by the profile in this process
+blocked = {}
+
+
+def current(name=None):
+    name = name or PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown PW_PROFILE {name}, use one of {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def launch_options(profile=None):
+    profile = profile or current()
+    options = {"headless": profile.headless, "slow_mo": profile.slow_mo}
+    if profile.args:
+        options["args"] = list(profile.args)
+    return options
+
+
+def context_options(profile=None):
+    profile = profile or current()
+    options = {"viewport": profile.viewport}
+    if profile.disable_animations:
+        options["reduced_motion"] = "reduce"
+    return options
+
+
+# Route blocking and animation switch-off for a new context, call before the first navigation.
+# Requests that are not blocked fall back to earlier routes (HAR replay) or the network
+def apply(context, profile=None):
+    profile = profile or current()
+    if profile.disable_animations:
+        context.add_init_script(NO_ANIMATIONS_JS)
+    if not profile.block:
+        return
+
+    def handle(route):
+        if should_block(route.request, profile):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    context.route("**/*", handle)
+
+
+# Same as apply() for a playwright.async_api context
+async def apply_async(context, profile=None):
+    profile = profile or current()
+    if profile.disable_animations:
+        await context.add_init_script(NO_ANIMATIONS_JS)
+    if not profile.block:
+        return
+
+    async def handle(route):
+        if should_block(route.request, profile):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    await context.route("**/*", handle)
+
+
+def should_block(request, profile):
+    if request.resource_type not in profile.block:
+        return False
+    blocked[request.resource_type] = blocked.get(request.resource_type, 0) + 1
+    return True
+
+
+def report():
+    if not blocked:
+        return []
+    return [f"{current().name} profile blocked " + ", ".join(f"{count} {kind}" for kind, count in sorted(blocked.items()))]
+
+
+# Median load time of url under each profile, e.g. python profiles.py https://www.rohlik.cz/ --runs 5
+def compare_load_times(urls, profile_names, runs):
+    from playwright.sync_api import sync_playwright
+
+    results = {}
+    with sync_playwright() as playwright:
+        for name in profile_names:
+            profile = current(name)
+            browser = playwright.chromium.launch(**{**launch_options(profile), "headless": True, "slow_mo": 0})
+            for url in urls:
+                times = []
+                for _ in range(runs):
+                    context = browser.new_context(**context_options(profile))
+                    apply(context, profile)
+                    page = context.new_page()
+                    page.goto(url, wait_until="load")
+                    times.append(page.evaluate(
+                        "() => { const n = performance.getEntriesByType('navigation')[0]; return n.loadEventEnd - n.startTime; }"))
+                    context.close()
+                results[name, url] = statistics.median(times)
+            browser.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare page load times of the execution profiles")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", default="ci")
+    parser.add_argument("--profile", default="perf")
+    args = parser.parse_args()
+
+    results = compare_load_times(args.urls, [args.baseline, args.profile], args.runs)
+    print(f"\n{'url':50} {args.baseline:>10} {args.profile:>10} {'saved':>8}")
+    for url in args.urls:
+        base, new = results[args.baseline, url], results[args.profile, url]
+        saved = (base - new) / base * 100 if base else 0
+        print(f"{url[:50]:50} {base:>8.0f}ms {new:>8.0f}ms {saved:>7.1f}%")
+    print(", ".join(report()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from artifacts import ARTIFACTS_DIR, ArtifactStore
+
+MODULES = [
+    "Demo_playwright_tests.py",
+    "login_test_kitner_courses.py",
+    "login_test_najada.py",
+    "test_login_matrix.py",
+    "test_add_items_to_cart.py",
+    "test_testrail_retest.py",
+    "test_todo_fuzz.py",
+    "test_artifacts.py",
+]
+
+# pytest runs in the suite directory with it as rootdir wherever this is started from,
+# so node ids (and the keys of the durations file) are always relative to it
+SUITE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Per-test durations from earlier runs, used to balance the shards
+DURATIONS_FILE = os.path.join(SUITE_DIR, ".test_durations.json")
+DEFAULT_DURATION = 5.0
+
+
+def pytest_command(*args):
+    return [sys.executable, "-m", "pytest", f"--rootdir={SUITE_DIR}", *args]
+
+
+# Module or node id given relative to the current directory -> relative to SUITE_DIR
+def suite_relative(test):
+    path, separator, rest = test.partition("::")
+    return os.path.relpath(os.path.abspath(path), SUITE_DIR).replace(os.sep, "/") + separator + rest
+
+
+def collect_tests(modules):
+    result = subprocess.run(
+        pytest_command("--collect-only", "-q", *modules),
+        cwd=SUITE_DIR, capture_output=True, text=True,
+    )
+    return [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+
+def load_durations():
+    if not os.path.exists(DURATIONS_FILE):
+        return {}
+    with open(DURATIONS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_durations(durations):
+    with open(DURATIONS_FILE, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+# Longest test first into the currently shortest shard (LPT scheduling)
+def make_shards(test_ids, workers, durations):
+    # Tests never seen before get the average of the known ones
+    default = sum(durations.values()) / len(durations) if durations else DEFAULT_DURATION
+    shards = [{"tests": [], "expected": 0.0} for _ in range(workers)]
+    for test_id in sorted(test_ids, key=lambda t: durations.get(t, default), reverse=True):
+        shard = min(shards, key=lambda s: s["expected"])
+        shard["tests"].append(test_id)
+        shard["expected"] += durations.get(test_id, default)
+    return [shard for shard in shards if shard["tests"]]
+
+
+def run_shard(index, shard, report_dir):
+    junit_file = os.path.join(report_dir, f"shard-{index}.xml")
+    env = dict(os.environ, TEST_WORKER_ID=f"w{index}", ARTIFACTS_DIR=os.path.join(report_dir, "shards"))
+    start = time.perf_counter()
+    result = subprocess.run(
+        pytest_command("-q", "-p", "no:cacheprovider", f"--junitxml={junit_file}", *shard["tests"]),
+        cwd=SUITE_DIR, env=env, capture_output=True, text=True,
+    )
+    print(f"Shard w{index}: {len(shard['tests'])} tests, expected {shard['expected']:.1f}s, "
+          f"took {time.perf_counter() - start:.1f}s, exit code {result.returncode}")
+    return junit_file, result
+
+
+# junit testcase -> pytest node id ("Demo_playwright_tests.py::test_add_task")
+def node_id(testcase):
+    module = testcase.get("classname", "").split(".")
+    path = module[0] + ".py"
+    return "::".join([path, *module[1:], testcase.get("name")])
+
+
+def merge_reports(junit_files, report_dir):
+    merged = ET.Element("testsuites")
+    durations = {}
+    for junit_file in junit_files:
+        if not os.path.exists(junit_file):
+            continue
+        for suite in ET.parse(junit_file).getroot().iter("testsuite"):
+            merged.append(suite)
+            for testcase in suite.iter("testcase"):
+                durations[node_id(testcase)] = float(testcase.get("time", 0))
+    ET.ElementTree(merged).write(os.path.join(report_dir, "report.xml"), encoding="utf-8", xml_declaration=True)
+    return merged, durations
+
+
+# Copy screenshots of all workers into one folder, prefixed by the worker that made them
+def merge_screenshots(report_dir):
+    shards_dir = os.path.join(report_dir, "shards")
+    target = os.path.join(report_dir, "screenshots")
+    os.makedirs(target, exist_ok=True)
+    if not os.path.isdir(shards_dir):
+        return
+    for worker in sorted(os.listdir(shards_dir)):
+        if worker == "store":
+            continue
+        for filename in os.listdir(os.path.join(shards_dir, worker)):
+            shutil.copy2(os.path.join(shards_dir, worker, filename), os.path.join(target, f"{worker}-{filename}"))
+
+
+# Failure artifacts of all shards are in one shared store, written out as files per failed test
+def export_failures(report_dir):
+    store_dir = os.path.join(report_dir, "shards", "store")
+    if not os.path.isdir(store_dir):
+        return
+    store = ArtifactStore(store_dir)
+    target = os.path.join(report_dir, "failures")
+    print(f"{store.export(target)} failure artifacts written to {target}")
+    store.close()
+
+
+def print_summary(merged):
+    counts = {"passed": 0, "failed": 0, "skipped": 0}
+    for testcase in merged.iter("testcase"):
+        if testcase.find("failure") is not None or testcase.find("error") is not None:
+            counts["failed"] += 1
+            print(f"FAILED {node_id(testcase)}")
+        elif testcase.find("skipped") is not None:
+            counts["skipped"] += 1
+        else:
+            counts["passed"] += 1
+    print(f"\n{counts['passed']} passed, {counts['failed']} failed, {counts['skipped']} skipped")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Playwright suites sharded across worker processes")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--report-dir", default=ARTIFACTS_DIR)
+    parser.add_argument("modules", nargs="*", help=f"default: {' '.join(MODULES)}")
+    args = parser.parse_args()
+    args.report_dir = os.path.abspath(args.report_dir)
+    modules = [suite_relative(module) for module in args.modules] or MODULES
+
+    shutil.rmtree(args.report_dir, ignore_errors=True)
+    os.makedirs(args.report_dir)
+
+    durations = load_durations()
+    shards = make_shards(collect_tests(modules), args.workers, durations)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(shards) or 1) as pool:
+        results = list(pool.map(lambda s: run_shard(*s, args.report_dir), enumerate(shards)))
+    print(f"\nSuite took {time.perf_counter() - start:.1f}s on {len(shards)} workers")
+
+    merged, new_durations = merge_reports([junit_file for junit_file, _ in results], args.report_dir)
+    merge_screenshots(args.report_dir)
+    export_failures(args.report_dir)
+    durations.update(new_durations)
+    save_durations(durations)
+
+    counts = print_summary(merged)
+    sys.exit(1 if counts["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
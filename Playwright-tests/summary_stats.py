@@ -0,0 +1,19 @@
+import math
+import statistics
+
+
+# Nearest-rank percentile, shared by the benchmark and the live event stream
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples):
+    median = statistics.median(samples)
+    return {
+        "median": round(median, 4),
+        "mad": round(statistics.median(abs(s - median) for s in samples), 4),
+        "p95": round(percentile(samples, 95), 4),
+        "runs": len(samples),
+        "samples": [round(s, 4) for s in samples],
+    }
@@ -0,0 +1,67 @@
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+
+# Reads every requested cell of every row inside the browser, so the whole table is one round-trip
+ROWS_JS = """(rows, fields) => rows.map(row => {
+    const record = {};
+    for (const [name, selector, source] of fields) {
+        const cell = row.querySelector(selector);
+        if (cell === null) {
+            record[name] = null;
+        } else if (source === "value") {
+            record[name] = cell.value;
+        } else {
+            record[name] = cell.innerText.trim();
+        }
+    }
+    return record;
+})"""
+
+
+def parse_price(text):
+    return Decimal(re.sub(r"[^\d.-]", "", text))
+
+
+# fields: {name: (cell selector, "text" or "value", converter)}, works for any `tbody tr` style table
+def extract_rows(page, fields, row_selector="tbody tr"):
+    spec = [[name, selector, source] for name, (selector, source, _) in fields.items()]
+    records = page.eval_on_selector_all(row_selector, ROWS_JS, spec)
+    return [
+        {name: (convert(record[name]) if record[name] is not None else None) for name, (_, _, convert) in fields.items()}
+        for record in records
+    ]
+
+
+@dataclass
+class CartLine:
+    name: str
+    unit_price: Decimal
+    line_price: Decimal
+    quantity: int
+
+
+CART_FIELDS = {
+    "name": ('span[data-test="product-title"]', "text", str),
+    "unit_price": ('span[data-test="product-price"]', "text", parse_price),
+    "line_price": ('span[data-test="line-price"]', "text", parse_price),
+    "quantity": ('input[data-test="product-quantity"]', "value", int),
+}
+
+
+# All cart lines plus the cart total shown under the table
+def read_cart(page):
+    lines = [CartLine(**record) for record in extract_rows(page, CART_FIELDS)]
+    total = parse_price(page.locator('td[data-test="cart-total"]').inner_text())
+    return lines, total
+
+
+def check_cart_totals(lines, total):
+    errors = []
+    for line in lines:
+        if line.unit_price * line.quantity != line.line_price:
+            errors.append(f"{line.name}: {line.quantity} x {line.unit_price} != {line.line_price}")
+    lines_total = sum((line.line_price for line in lines), Decimal("0"))
+    if lines_total != total:
+        errors.append(f"Sum of lines {lines_total} != cart total {total}")
+    assert not errors, "Cart does not add up:\n" + "\n".join(errors)
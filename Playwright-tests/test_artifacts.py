@@ -0,0 +1,39 @@
+import uuid
+
+import artifacts
+from artifacts import ArtifactStore, watch
+
+
+# A page of a session fixture is reused by the next case; when that case fails it still gets its screenshot,
+# DOM and its own trace, and watching the page again does not double the step listeners
+def test_failure_on_reused_page_is_captured(shared_browser, monkeypatch) -> None:
+    monkeypatch.setattr(artifacts, "TRACE", True)
+    monkeypatch.setattr(artifacts, "RING_SIZE", 10)
+    context = shared_browser.new_context()
+    try:
+        page = context.new_page()
+
+        # first case passes
+        artifacts.reset()
+        watch(page)
+        page.goto("data:text/html,<h1>first case</h1>")
+
+        # second case fails on the same page
+        artifacts.reset()
+        watch(page)
+        watch(page)
+        page.goto("data:text/html,<h1>second case</h1>")
+        test_id = f"test_artifacts.py::reused_page_{uuid.uuid4().hex}"
+        artifacts.capture_failure(test_id, artifacts.watched)
+
+        navigations = [step for step in artifacts.steps if "navigated to" in step]
+        assert len(navigations) == 1 and "second case" in navigations[0]
+        store = ArtifactStore()
+        try:
+            names = {name for _, name, _ in store.artifacts(test_id)}
+        finally:
+            store.close()
+        assert {"screenshot.png", "dom.html", "trace.zip", "steps.txt"} <= names
+    finally:
+        artifacts.reset()
+        context.close()
@@ -0,0 +1,66 @@
+import pytest
+from playwright.sync_api import Page, expect
+
+import har_replay
+from artifacts import watch
+import profiles
+from login_matrix import PROFILES, SiteProfile, expand, login
+
+MATRIX = expand(PROFILES)
+
+# Login form whose error message goes away once the fields are edited, like the matrix sites' validation
+LOCAL_FORM = """
+<input id="email"><input id="password" type="password"><button id="submit">Přihlásit</button>
+<p id="email-error" hidden>Zadejte platný email</p>
+<script>
+    const error = document.getElementById("email-error");
+    document.getElementById("submit").onclick = () => { error.hidden = false; };
+    for (const input of document.querySelectorAll("input")) input.oninput = () => { error.hidden = true; };
+</script>
+"""
+
+
+# One page per site for the whole matrix, the login form is reused between cases (see login_matrix.reset_form)
+@pytest.fixture(scope="session")
+def site_pages(shared_browser):
+    contexts = {}
+
+    def page_for(site):
+        if site.name not in contexts:
+            context = shared_browser.new_context(**profiles.context_options())
+            har_replay.attach(context, f"test_login_matrix.py::{site.name}", site.first_party)
+            profiles.apply(context)
+            contexts[site.name] = context
+            context.new_page()
+        # watched again by every case, failure capture only covers the pages of the running test
+        return watch(contexts[site.name].pages[0])
+
+    yield page_for
+    for context in contexts.values():
+        context.close()
+
+
+@pytest.mark.parametrize("case", MATRIX, ids=[case.id for case in MATRIX])
+def test_login_rejected(site_pages, case) -> None:
+    page: Page = site_pages(case.site)
+    login(page, case.site, case.user, case.password, reuse=True)
+    for error in case.expected_errors:
+        expect(page.locator(case.site.errors[error]).first, f"{error} error message not visible").to_be_visible()
+
+
+# Consecutive cases reuse the form: one navigation for the whole sequence, each error is the new case's own
+def test_login_form_reused(shared_browser) -> None:
+    site = SiteProfile(name="local", url="http://login.test/", first_party=("login.test",), user_field="#email",
+                       password_field="#password", submit="#submit", errors={"email": "#email-error"})
+    context = shared_browser.new_context(**profiles.context_options())
+    try:
+        context.route("http://login.test/**", lambda route: route.fulfill(body=LOCAL_FORM, content_type="text/html"))
+        page = watch(context.new_page())
+        navigations = []
+        page.on("framenavigated", lambda frame: frame.parent_frame is None and navigations.append(frame.url))
+        for user in ("neexistujici@seznam.cz", "", "123@seznam.cz"):
+            login(page, site, user, "chyba", reuse=True)
+            expect(page.locator("#email-error"), f"no error for {user!r}").to_be_visible()
+        assert len(navigations) == 1
+    finally:
+        context.close()
@@ -0,0 +1,51 @@
+import os
+import pytest
+from browser_pool import new_page
+from testrail_scenarios import compile_exports, run_scenario
+from select_tests import RESULTS_STORE, ResultsStore, select
+
+# Saved storage_state of a logged-in iDoklad user, the iDoklad cases are skipped without it
+IDOKLAD_STORAGE_STATE = os.environ.get("IDOKLAD_STORAGE_STATE")
+
+# Filled while test_retest_case is collected, nothing is parsed on import
+SCENARIOS = {}
+
+
+# Only Failed / Retest cases, cases with an open defect and cases whose steps changed since they passed
+def pytest_generate_tests(metafunc):
+    if metafunc.function is not test_retest_case:
+        return
+    compiled = compile_exports()
+    SCENARIOS.update({case.case_id: scenario for case, scenario in compiled})
+    # collecting only reads the stored results, the store file is created by the first recorded result
+    store = ResultsStore(RESULTS_STORE if os.path.exists(RESULTS_STORE) else ":memory:")
+    try:
+        retest_cases, _ = select([case for case, _ in compiled], store)
+    finally:
+        store.close()
+    metafunc.parametrize("case, reason", retest_cases, ids=[case.case_id for case, _ in retest_cases])
+
+
+@pytest.fixture(scope="session")
+def results_store():
+    store = ResultsStore()
+    yield store
+    store.close()
+
+
+def test_retest_case(shared_browser, results_store, case, reason) -> None:
+    scenario = SCENARIOS[case.case_id]
+    if not scenario.runnable:
+        pytest.skip(f"{case.case_id} has steps that still need a human: {'; '.join(scenario.manual)}")
+    context_options = {}
+    if scenario.needs_login:
+        if not IDOKLAD_STORAGE_STATE:
+            pytest.skip("Set IDOKLAD_STORAGE_STATE to a logged-in iDoklad storage state")
+        context_options["storage_state"] = IDOKLAD_STORAGE_STATE
+    with new_page(shared_browser, **context_options) as page:
+        try:
+            run_scenario(page, scenario)
+        except Exception as error:
+            results_store.record(case, "Failed", f"Selected because: {reason}\n{error}")
+            raise
+    results_store.record(case, "Passed", f"Selected because: {reason}")
@@ -0,0 +1,15 @@
+import os
+from playwright.sync_api import Page
+
+from todo_fuzz import format_failure, fuzz
+
+# Longer runs: FUZZ_SEQUENCES=50 FUZZ_LENGTH=500, or python todo_fuzz.py
+SEQUENCES = int(os.environ.get("FUZZ_SEQUENCES", 3))
+LENGTH = int(os.environ.get("FUZZ_LENGTH", 100))
+SEED = int(os.environ.get("FUZZ_SEED", 0))
+
+
+def test_todomvc_matches_model(fresh_page: Page, todomvc_url) -> None:
+    # Random sequences of the Demo_playwright_tests.py helpers, the page is compared with TodoModel every 10 steps
+    result = fuzz(fresh_page, todomvc_url, SEQUENCES, LENGTH, SEED)
+    assert result.failing is None, format_failure(result)
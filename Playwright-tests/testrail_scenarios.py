@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from playwright.sync_api import Page, expect
+
+# testrail_csv lives in the Test_tools folder next to this one
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Test_tools"))
+from testrail_csv import iter_cases  # noqa: E402
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+EXPORTS = [
+    os.path.join(REPO_DIR, "User_registration_testing", "User_registration_testing.csv"),
+    os.path.join(REPO_DIR, "Idoklad_shipping_address_testing", "Idoklad.cz_testing_shipping_address.csv"),
+]
+
+# Compiled scenarios keyed by Case ID, reused while the hash of the row stays the same
+CACHE_FILE = os.environ.get("SCENARIO_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".scenario_cache.json"))
+
+# Columns the compiler reads, only a change in these (or in COMPILER_VERSION) invalidates a cached scenario
+HASHED_COLUMNS = ("title", "preconditions", "steps", "expected_result")
+COMPILER_VERSION = 2
+
+# Lines that only introduce the following block of clicks or form data
+BLOCK_HEADERS = ("Vyplň tabulku", "Vyplním", "Postupně kliknu na", "U dodací adresy vyplním")
+
+# Radio buttons that appear as a bare line inside a "fill in" block
+RADIO_OPTIONS = {"Fyzická osoba", "Právnická osoba"}
+
+# Registration columns that identify a row in the list of registered users
+LIST_COLUMNS = ("Jméno", "Příjmení", "Email")
+
+STEP = re.compile(r"^(\d+)\.\s*(.*)$")
+QUOTED = re.compile(r'"([^"]+)"')
+CLICK = re.compile(r'^(?:Klik(?:ni)? na\s*)?"([^"]+)"$')
+FIELD = re.compile(r"^([^:]{2,40}):\s*(.*)$")
+REPEAT = re.compile(r"Zopakujte kroky (\d+)\.\s*-\s*(\d+)\.")
+URL = re.compile(r"https?://\S+")
+
+
+@dataclass
+class Action:
+    kind: str  # goto, fill, check, uncheck, click, expect_text, expect_row, expect_no_row
+    target: str = ""
+    value: object = None
+
+
+@dataclass
+class Scenario:
+    case_id: str
+    title: str
+    row_hash: str
+    base_url: str
+    actions: list = field(default_factory=list)
+    manual: list = field(default_factory=list)  # step lines the compiler could not turn into actions
+
+    @property
+    def needs_login(self):
+        return "app.idoklad.cz" in self.base_url
+
+    @property
+    def runnable(self):
+        return not self.manual and any(a.kind.startswith("expect") for a in self.actions)
+
+
+def row_hash(case):
+    data = json.dumps([COMPILER_VERSION] + [getattr(case, column) for column in HASHED_COLUMNS], ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+# Step text -> {step number: [lines]}
+def split_steps(text):
+    steps = {}
+    number = 0
+    for line in text.replace("\r", "").split("\n"):
+        line = line.strip()
+        if match := STEP.match(line):
+            number = int(match[1])
+            line = match[2].strip()
+        if line:
+            steps.setdefault(number, []).append(line)
+    return steps
+
+
+def compile_case(case):
+    urls = URL.findall(case.preconditions)
+    base_url = urls[0] if urls else ""
+    list_url = urls[1] if len(urls) > 1 else ""
+    scenario = Scenario(case.case_id, case.title, row_hash(case), base_url)
+
+    # Quoted messages of the expected result are checked after the last click
+    messages = QUOTED.findall(case.expected_result)
+    listing = [line.strip() for line in case.expected_result.splitlines() if "objeví" in line]
+    should_appear = any("neobjeví" not in line for line in listing)
+    should_not_appear = any("neobjeví" in line for line in listing)
+    # "dvě duplikátní registrace" is about how many rows there are, which expect_row / expect_no_row can't tell
+    counted = [line for line in listing if re.search(r"\bdvě\b|duplik", line)]
+    if counted or (should_appear and should_not_appear):
+        scenario.manual.extend(f"expected result: {line}" for line in counted or listing)
+        should_appear = should_not_appear = False
+
+    step_actions = {}
+    filled = {}
+    for number, lines in split_steps(case.steps).items():
+        actions = step_actions.setdefault(number, [])
+        for line in lines:
+            if line.startswith(BLOCK_HEADERS):
+                continue
+            if match := REPEAT.search(line):
+                first, last = int(match[1]), int(match[2])
+                # the repeated steps start on the form again, as the first run did
+                if base_url and first <= min(step_actions):
+                    actions.append(Action("goto", base_url))
+                actions.extend(a for n in range(first, last + 1) for a in step_actions.get(n, []))
+            elif match := CLICK.match(line):
+                actions.append(Action("click", match[1]))
+            elif line in RADIO_OPTIONS:
+                actions.append(Action("check", line))
+            elif line.startswith("Nezaškrtnout "):
+                actions.append(Action("uncheck", "souhlas" if "souhlas" in line else line[len("Nezaškrtnout "):].rstrip(".")))
+            elif line.startswith("Zaškrtnout "):
+                actions.append(Action("check", "souhlas" if "souhlas" in line else line[len("Zaškrtnout "):].rstrip(".")))
+            elif line.startswith("Ověřit údaje v tabulce") and list_url:
+                actions.append(Action("goto", list_url))
+            elif (match := FIELD.match(line)) and not URL.match(line):
+                label, value = match[1].strip(), match[2].strip()
+                filled[label] = value
+                actions.append(Action("fill", label, value))
+            else:
+                scenario.manual.append(line)
+
+    actions = [Action("goto", base_url)] if base_url else []
+    for number in sorted(step_actions):
+        actions.extend(step_actions[number])
+    # The expected result describes the end state: the list is checked at the last look into it only
+    last_listing = max((i for i, a in enumerate(actions) if a.kind == "goto" and a.target == list_url), default=None)
+    if last_listing is not None and (should_appear or should_not_appear):
+        values = [filled[column] for column in LIST_COLUMNS if filled.get(column)]
+        actions.insert(last_listing + 1, Action("expect_row" if should_appear else "expect_no_row", value=values))
+    last_click = max((i for i, a in enumerate(actions) if a.kind == "click"), default=None)
+    if last_click is not None and messages:
+        actions[last_click + 1:last_click + 1] = [Action("expect_text", message) for message in messages]
+    if not any(a.kind.startswith("expect") for a in actions) and not scenario.manual:
+        scenario.manual.append(f"expected result: {' '.join(case.expected_result.split()) or '(empty)'}")
+    scenario.actions = actions
+    return scenario
+
+
+def load_cache():
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    with open(CACHE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def scenario_from_dict(data):
+    return Scenario(**{**data, "actions": [Action(**a) for a in data["actions"]]})
+
+
+# Compiles every row of the exports, rows whose hash did not change come from the cache.
+# Returns [(TestCase, Scenario)] in export order
+def compile_exports(paths=EXPORTS):
+    cache = load_cache()
+    compiled = []
+    changed = 0
+    for path in paths:
+        for case in iter_cases(path):
+            cached = cache.get(case.case_id)
+            if cached and cached["row_hash"] == row_hash(case):
+                scenario = scenario_from_dict(cached)
+            else:
+                scenario = compile_case(case)
+                cache[case.case_id] = asdict(scenario)
+                changed += 1
+            compiled.append((case, scenario))
+    if changed:
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1, ensure_ascii=False)
+    return compiled
+
+
+def field_locator(page: Page, label):
+    return page.get_by_label(label).first
+
+
+def row_locator(page: Page, values):
+    rows = page.locator("tr")
+    for value in values:
+        rows = rows.filter(has_text=value)
+    return rows
+
+
+def run_scenario(page: Page, scenario):
+    for action in scenario.actions:
+        if action.kind == "goto":
+            page.goto(action.target)
+            page.wait_for_load_state("load")
+        elif action.kind == "fill":
+            locator = field_locator(page, action.target)
+            if locator.evaluate("element => element.tagName") == "SELECT":
+                locator.select_option(label=action.value)
+            else:
+                locator.fill(action.value)
+        elif action.kind == "check":
+            field_locator(page, action.target).check()
+        elif action.kind == "uncheck":
+            field_locator(page, action.target).uncheck()
+        elif action.kind == "click":
+            page.get_by_role("button", name=action.target).or_(page.get_by_text(action.target, exact=True)).first.click()
+        elif action.kind == "expect_text":
+            expect(page.get_by_text(action.target).first, f"{scenario.case_id}: message not shown").to_be_visible()
+        elif action.kind == "expect_row":
+            expect(row_locator(page, action.value).first, f"{scenario.case_id}: registration not in the list").to_be_visible()
+        elif action.kind == "expect_no_row":
+            expect(row_locator(page, action.value), f"{scenario.case_id}: registration should not be in the list").to_have_count(0)
+        else:
+            raise ValueError(f"Unknown action {action.kind}")
+
+
+if __name__ == "__main__":
+    for case, scenario in compile_exports():
+        state = "runnable" if scenario.runnable else f"manual ({len(scenario.manual)} steps)"
+        print(f"{case.case_id:7} {case.status:7} {len(scenario.actions):3} actions  {state:20} {case.title}")
@@ -0,0 +1,249 @@
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from playwright.sync_api import sync_playwright
+
+import Demo_playwright_tests as todo
+import profiles
+from browser_pool import launch_browser
+from todomvc_server import app_url, start_server
+
+FILTERS = ("All", "Active", "Completed")
+
+# How often each operation is picked, among the ones possible in the current state
+WEIGHTS = {"add": 30, "complete": 15, "activate": 10, "edit": 10, "delete": 10, "filter": 10, "clear_completed": 5}
+# Longer lists only make every lookup slower, not the sequences more interesting
+MAX_ITEMS = 30
+
+# Everything the model predicts, read from the page in one call
+UI_STATE_JS = """() => ({
+    visible: [...document.querySelectorAll("ul.todo-list > li")].map(li => [li.querySelector("label").textContent, li.classList.contains("completed")]),
+    stored: JSON.parse(localStorage.getItem("react-todos") || "[]").map(todo => [todo.title, todo.completed]),
+    left: (document.querySelector(".todo-count") || {}).textContent || "",
+    filter: (document.querySelector(".filters a.selected") || {}).textContent || null,
+})"""
+
+
+# Reference model of the app: the todo list and the selected filter
+@dataclass
+class TodoModel:
+    todos: list = field(default_factory=list)  # [title, completed]
+    filter: str = "All"
+
+    def visible(self):
+        return [todo for todo in self.todos if self.filter == "All" or todo[1] == (self.filter == "Completed")]
+
+    def find(self, title):
+        return next((todo for todo in self.visible() if todo[0] == title), None)
+
+    # Applies an operation, False when it is not possible in this state (e.g. the item is filtered out)
+    def apply(self, op):
+        kind, args = op[0], op[1:]
+        if kind == "add":
+            self.todos.append([args[0], False])
+            return True
+        if kind == "filter":
+            if not self.todos:  # the footer with the filters is hidden
+                return False
+            self.filter = args[0]
+            return True
+        if kind == "clear_completed":
+            if not any(completed for _, completed in self.todos):
+                return False
+            self.todos = [todo for todo in self.todos if not todo[1]]
+            return True
+        todo_ = self.find(args[0])
+        if todo_ is None:
+            return False
+        if kind == "complete" and not todo_[1]:
+            todo_[1] = True
+        elif kind == "activate" and todo_[1]:
+            todo_[1] = False
+        elif kind == "edit":
+            if args[1]:
+                todo_[0] = args[1]
+            else:  # an empty title removes the item
+                self.todos.remove(todo_)
+        elif kind == "delete":
+            self.todos.remove(todo_)
+        else:
+            return False
+        return True
+
+    def expected_state(self):
+        left = sum(not completed for _, completed in self.todos)
+        return {
+            "visible": [list(todo) for todo in self.visible()],
+            "stored": [list(todo) for todo in self.todos],
+            "left": f"{left} {'item' if left == 1 else 'items'} left",
+            "filter": self.filter,
+        }
+
+
+# Titles are numbered so that none is a substring of another (the helpers find items by text)
+def new_title(rng, counter):
+    return f"task {counter:05d}" + rng.choice(["", " úkol", " <b>x</b>", " 😀"])
+
+
+# Random valid sequence of `length` operations, built against the model so every step is possible
+def generate(length, seed=0):
+    rng = random.Random(seed)
+    model = TodoModel()
+    ops = []
+    counter = 0
+    while len(ops) < length:
+        kind = rng.choices(list(WEIGHTS), weights=list(WEIGHTS.values()))[0]
+        visible = model.visible()
+        if kind == "add":
+            if len(model.todos) >= MAX_ITEMS:
+                continue
+            counter += 1
+            op = ("add", new_title(rng, counter))
+        elif kind == "filter":
+            op = ("filter", rng.choice(FILTERS))
+        elif kind == "clear_completed":
+            op = ("clear_completed",)
+        elif not visible:
+            continue
+        elif kind == "edit":
+            counter += 1
+            op = ("edit", rng.choice(visible)[0], "" if rng.random() < 0.1 else new_title(rng, counter))
+        else:
+            targets = [todo_ for todo_ in visible if kind == "delete" or todo_[1] == (kind == "activate")]
+            if not targets:
+                continue
+            op = (kind, rng.choice(targets)[0])
+        if model.apply(op):
+            ops.append(op)
+    return ops
+
+
+def perform(page, op):
+    kind, args = op[0], op[1:]
+    if kind == "add":
+        todo.add_task(page, args[0])
+    elif kind == "edit":
+        todo.edit_task(page, args[0], args[1])
+    elif kind == "delete":
+        todo.delete_task(page, args[0])
+    elif kind == "complete":
+        todo.mark_task_as_completed(page, args[0])
+    elif kind == "activate":
+        todo.mark_task_as_active(page, args[0])
+    elif kind == "clear_completed":
+        todo.clear_completed_tasks(page)
+    elif kind == "filter":
+        todo.filter_tasks_by_status(page, args[0])
+
+
+def differences(expected, actual):
+    return [f"{key}: expected {expected[key]!r}, got {actual[key]!r}" for key in expected if expected[key] != actual[key]]
+
+
+def reset(page, url):
+    page.goto(url)
+    page.evaluate("localStorage.clear()")
+    page.reload()
+
+
+# Replays ops from an empty list and compares the page with the model after every `check_every` operations
+# (and after the last). Returns None, or (number of operations run, problems)
+def run_sequence(page, url, ops, check_every=10):
+    reset(page, url)
+    model = TodoModel()
+    for index, op in enumerate(ops, 1):
+        if not model.apply(op):
+            return None  # only reachable while shrinking, the sequence is not a valid one
+        try:
+            perform(page, op)
+        except Exception as error:
+            return index, [f"{op!r} failed: {str(error).splitlines()[0]}"]
+        if index % check_every == 0 or index == len(ops):
+            problems = differences(model.expected_state(), page.evaluate(UI_STATE_JS))
+            if problems:
+                return index, problems
+    return None
+
+
+# Smallest failing sequence found by removing chunks of operations (delta debugging), checking after
+# every operation so the failure is pinned to its step
+def shrink(page, url, ops, failure):
+    ops = ops[:failure[0]]
+    chunk = max(len(ops) // 2, 1)
+    while chunk >= 1:
+        start, removed = 0, False
+        while start < len(ops):
+            candidate = ops[:start] + ops[start + chunk:]
+            result = run_sequence(page, url, candidate, check_every=1) if candidate else None
+            if result:
+                ops, failure, removed = candidate[:result[0]], result, True
+            else:
+                start += chunk
+        if not removed:
+            chunk //= 2
+    return ops, failure
+
+
+@dataclass
+class FuzzResult:
+    seed: int
+    operations: int
+    seconds: float
+    failing: list = None  # shrunk sequence
+    problems: list = None
+
+
+# `sequences` random sequences of `length` operations, stops at the first failure and shrinks it
+def fuzz(page, url, sequences=10, length=200, seed=0, check_every=10):
+    operations, start = 0, time.perf_counter()
+    for number in range(sequences):
+        ops = generate(length, seed + number)
+        failure = run_sequence(page, url, ops, check_every)
+        if failure:
+            operations += failure[0]
+            failing, failure = shrink(page, url, ops, failure)
+            return FuzzResult(seed + number, operations, time.perf_counter() - start, failing, failure[1])
+        operations += len(ops)
+    return FuzzResult(seed, operations, time.perf_counter() - start)
+
+
+def format_failure(result):
+    lines = [f"seed {result.seed}, shrunk to {len(result.failing)} operations:"]
+    lines += [f"  {i}. {' '.join(map(repr, op))}" for i, op in enumerate(result.failing, 1)]
+    lines += [f"  {problem}" for problem in result.problems]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Model-based random testing of the local TodoMVC")
+    parser.add_argument("-s", "--sequences", type=int, default=10)
+    parser.add_argument("-n", "--length", type=int, default=200, help="operations per sequence")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check-every", type=int, default=10, help="operations between two UI checks")
+    parser.add_argument("--url", help="default: the bundled TodoMVC")
+    args = parser.parse_args()
+
+    server = None if args.url else start_server()
+    url = args.url or app_url(server)
+    with sync_playwright() as playwright:
+        browser = launch_browser(playwright)
+        context = browser.new_context(**profiles.context_options())
+        profiles.apply(context)
+        result = fuzz(context.new_page(), url, args.sequences, args.length, args.seed, args.check_every)
+        browser.close()
+    if server:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{result.operations} operations in {result.seconds:.1f}s, "
+          f"{result.operations / result.seconds * 60:.0f} operations per minute")
+    if result.failing:
+        print(format_failure(result))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
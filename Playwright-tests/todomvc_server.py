@@ -0,0 +1,36 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+REMOTE_URL = "https://demo.playwright.dev/todomvc#/"
+
+# Bundled copy of the TodoMVC app with the same markup as the remote demo
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "todomvc")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+# Serves APP_DIR on a free localhost port from a background thread
+def start_server(directory=APP_DIR, host="127.0.0.1", port=0):
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def app_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/#/"
+
+
+if __name__ == "__main__":
+    server = start_server(port=int(os.environ.get("TODOMVC_PORT", 8000)))
+    print(f"Serving local TodoMVC on {app_url(server)} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,76 @@
+import os
+import time
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# WAITS_INSTRUMENT=1 records how long every replaced fixed sleep would have cost
+INSTRUMENT = os.environ.get("WAITS_INSTRUMENT") == "1"
+
+# (label, fixed sleep in ms, time the event based wait really took in ms)
+measurements = []
+
+# Resolves once nothing in the observed subtree changed for quietMs milliseconds
+DOM_QUIET_JS = """([selector, quietMs, timeoutMs]) => new Promise((resolve, reject) => {
+    const target = (selector && document.querySelector(selector)) || document.body;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quietMs);
+    });
+    let timer = setTimeout(done, quietMs);
+    const deadline = setTimeout(() => {
+        observer.disconnect();
+        reject(new Error(`DOM of ${selector || "body"} still changing after ${timeoutMs} ms`));
+    }, timeoutMs);
+    function done() {
+        observer.disconnect();
+        clearTimeout(deadline);
+        resolve();
+    }
+    observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+})"""
+
+
+# With required=False a page that never goes idle (trackers, long-polling) only costs the timeout: returns False
+def wait_for_network_idle(page, timeout=10000, required=True):
+    try:
+        page.wait_for_load_state("networkidle", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        if required:
+            raise
+        return False
+
+
+# Runs action and returns as soon as a response with url_part in its URL arrives
+def wait_for_response(page, url_part, action, timeout=10000):
+    with page.expect_response(lambda response: url_part in response.url, timeout=timeout) as response_info:
+        action()
+    return response_info.value
+
+
+def wait_for_dom_stable(page, selector=None, quiet_ms=100, timeout=10000):
+    page.evaluate(DOM_QUIET_JS, [selector, quiet_ms, timeout])
+
+
+# Drop-in replacement of page.wait_for_timeout(fixed_ms), waits only until `wait` returns
+def instead_of_sleep(fixed_ms, label, wait):
+    start = time.perf_counter()
+    result = wait()
+    if INSTRUMENT:
+        measurements.append((label, fixed_ms, (time.perf_counter() - start) * 1000))
+    return result
+
+
+def report():
+    if not measurements:
+        return []
+    lines = [f"{'wait':45} {'calls':>5} {'fixed ms':>10} {'event ms':>10} {'saved ms':>10}"]
+    totals = {}
+    for label, fixed_ms, waited_ms in measurements:
+        calls, fixed, waited = totals.get(label, (0, 0, 0))
+        totals[label] = (calls + 1, fixed + fixed_ms, waited + waited_ms)
+    for label, (calls, fixed, waited) in sorted(totals.items(), key=lambda item: item[1][2] - item[1][1]):
+        lines.append(f"{label:45} {calls:>5} {fixed:>10.0f} {waited:>10.0f} {fixed - waited:>10.0f}")
+    fixed_total = sum(m[1] for m in measurements)
+    waited_total = sum(m[2] for m in measurements)
+    lines.append(f"{'total':45} {len(measurements):>5} {fixed_total:>10.0f} {waited_total:>10.0f} {fixed_total - waited_total:>10.0f}")
+    return lines
@@ -0,0 +1,175 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from playwright.sync_api import BrowserContext, Playwright, sync_playwright
+
+import profiles
+from catalog_index import SHOP_URL
+from locators import locate
+from login_matrix import PROFILES
+
+# Primed Chromium user-data directories, one per site. WARM_START=1 makes the suites open their sites from them
+WARM_DIR = os.environ.get("WARM_DIR", ".warm_profiles")
+ENABLED = os.environ.get("WARM_START") == "1"
+# Snapshots older than this are ignored (and should be primed again), in seconds
+MAX_AGE = int(os.environ.get("WARM_MAX_AGE", 7 * 24 * 3600))
+
+# site -> (url, locator name of the element the first interaction needs)
+SITES = {
+    "shop": (SHOP_URL + "/", "product_card"),
+    "kitner": (PROFILES["kitner"].url, "user_field"),
+    "najada": (PROFILES["najada"].url, "open_form"),
+    "rohlik": (PROFILES["rohlik"].url, "open_form"),
+}
+
+# Chromium's profile lock; a copy must not carry the lock of the process that primed it
+LOCK_FILES = shutil.ignore_patterns("Singleton*", "lockfile")
+
+
+def snapshot_dir(site):
+    return os.path.join(WARM_DIR, site)
+
+
+def metadata_path(site):
+    return os.path.join(WARM_DIR, f"{site}.json")
+
+
+# Metadata of a usable snapshot, None when there is none, it is too old or was primed by another Chromium build
+def snapshot(site, playwright: Playwright):
+    if not os.path.isdir(snapshot_dir(site)) or not os.path.exists(metadata_path(site)):
+        return None
+    with open(metadata_path(site), encoding="utf-8") as f:
+        meta = json.load(f)
+    if time.time() - meta["primed_at"] > MAX_AGE or meta["executable"] != playwright.chromium.executable_path:
+        return None
+    return meta
+
+
+# Time from launch until the first interactive element of the site is visible, in seconds
+def open_site(playwright: Playwright, site, user_data_dir):
+    url, ready = SITES[site]
+    start = time.perf_counter()
+    context = playwright.chromium.launch_persistent_context(
+        user_data_dir, **{**profiles.launch_options(), **profiles.context_options()})
+    try:
+        page = context.pages[0] if context.pages else context.new_page()
+        page.goto(url)
+        locate(page, site, ready).first.wait_for(state="visible")
+        return time.perf_counter() - start, context
+    except Exception:
+        context.close()
+        raise
+
+
+# Visits the site `visits` times in a new profile so the HTTP cache and V8's code cache (written on
+# repeated script runs) are filled, then swaps it in as the site's snapshot
+def prime(playwright: Playwright, site, visits=3):
+    os.makedirs(WARM_DIR, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=f"{site}-", dir=WARM_DIR)
+    try:
+        for _ in range(visits):
+            _, context = open_site(playwright, site, build_dir)
+            context.pages[0].wait_for_load_state("networkidle")
+            context.close()
+        reset(site)
+        os.replace(build_dir, snapshot_dir(site))
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    meta = {"url": SITES[site][0], "primed_at": time.time(), "visits": visits,
+            "executable": playwright.chromium.executable_path}
+    with open(metadata_path(site), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+# Back to a pristine state: the snapshot is deleted, the next warm launch is a cold one until primed again
+def reset(site):
+    shutil.rmtree(snapshot_dir(site), ignore_errors=True)
+    if os.path.exists(metadata_path(site)):
+        os.remove(metadata_path(site))
+
+
+# Private copy of the snapshot, so parallel workers never write to it or share Chromium's profile lock
+def working_copy(site, playwright: Playwright):
+    target = tempfile.mkdtemp(prefix=f"warm-{site}-")
+    if snapshot(site, playwright):
+        shutil.copytree(snapshot_dir(site), target, symlinks=True, ignore=LOCK_FILES, dirs_exist_ok=True)
+    else:
+        print(f"\nNo usable warm profile for {site}, starting cold (python warm_start.py prime {site})")
+    return target
+
+
+# Persistent context started from a copy of the site's snapshot; the copy is removed when the context closes
+def launch_warm(playwright: Playwright, site, **context_options) -> BrowserContext:
+    user_data_dir = working_copy(site, playwright)
+    context = playwright.chromium.launch_persistent_context(
+        user_data_dir, **{**profiles.launch_options(), **profiles.context_options(), **context_options})
+    context.once("close", lambda _: shutil.rmtree(user_data_dir, ignore_errors=True))
+    return context
+
+
+# Cold (empty profile) vs warm (copy of the snapshot, copying included) time to first interaction
+def measure(playwright: Playwright, site, runs=5):
+    results = {"cold": [], "warm": []}
+    for _ in range(runs):
+        for kind in results:
+            start = time.perf_counter()
+            user_data_dir = working_copy(site, playwright) if kind == "warm" else tempfile.mkdtemp(prefix=f"cold-{site}-")
+            prepared = time.perf_counter() - start
+            try:
+                seconds, context = open_site(playwright, site, user_data_dir)
+                context.close()
+                results[kind].append(prepared + seconds)
+            finally:
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Primed browser profiles for a faster first page load")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in [("prime", "build the snapshots"), ("reset", "delete the snapshots"),
+                            ("measure", "time to first interaction, cold vs warm"), ("status", "list the snapshots")]:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("sites", nargs="*", help=f"default: all of {', '.join(sorted(SITES))}")
+        if name == "prime":
+            command.add_argument("--visits", type=int, default=3)
+        if name == "measure":
+            command.add_argument("-n", "--runs", type=int, default=5)
+    args = parser.parse_args()
+    sites = args.sites or sorted(SITES)
+    unknown = set(sites) - set(SITES)
+    if unknown:
+        parser.error(f"unknown site(s): {', '.join(sorted(unknown))}")
+
+    if args.command == "reset":
+        for site in sites:
+            reset(site)
+            print(f"{site}: reset")
+        return 0
+
+    with sync_playwright() as playwright:
+        for site in sites:
+            if args.command == "prime":
+                prime(playwright, site, args.visits)
+                print(f"{site}: primed")
+            elif args.command == "status":
+                meta = snapshot(site, playwright)
+                print(f"{site}: " + (f"primed {time.strftime('%Y-%m-%d %H:%M', time.localtime(meta['primed_at']))}"
+                                     if meta else "none or outdated"))
+            else:
+                results = measure(playwright, site, args.runs)
+                cold, warm = statistics.median(results["cold"]), statistics.median(results["warm"])
+                print(f"{site}: time to first interaction over {args.runs} runs, median cold {cold * 1000:.0f} ms, "
+                      f"warm {warm * 1000:.0f} ms ({(cold - warm) / cold:.0%} saved)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
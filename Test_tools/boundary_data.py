@@ -0,0 +1,230 @@
+import argparse
+import csv
+import itertools
+import json
+import random
+import string
+import sys
+from dataclasses import dataclass
+
+INT32_MAX = 2 ** 31 - 1
+
+CZECH = "áčďéěíňóřšťúůýžÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ"
+
+# Characters grouped by the kind of trouble they cause
+UNICODE_CLASSES = {
+    "ascii_letters": string.ascii_letters,
+    "czech_diacritics": CZECH,
+    "latin1": "ßäöüÄÖÜàâçèêëîïôœùûÿ",
+    "cyrillic": "абвгдежзийклмнопрстуфхцчшщъыьэюя",
+    "cjk": "漢字仮名交じり文",
+    "emoji": "😀🚀👍🏽🇨🇿",  # outside the BMP, two UTF-16 units each
+    "combining": "e\u0301a\u030cz\u030c",  # decomposed é, ǎ, ž
+    "zero_width": "\u200b\u200c\u200d\ufeff",
+    "rtl": "العربية",
+    "control": "\t\n\r\x00\x1b",
+    "punctuation": "**/;=´§¨)[]@#$%^&*()_+{}|:<>?~",  # ID-1188 invalid address characters
+    "digits": string.digits,
+    "fullwidth_digits": "０１２３４５６７８９",
+}
+
+INJECTION = ["<script>alert(1)</script>", "' OR '1'='1' --", "\"; DROP TABLE users; --", "${7*7}", "{{7*7}}", "../../etc/passwd"]
+
+INTEGER_EDGES = [0, 1, -1, -42, INT32_MAX - 1, INT32_MAX, INT32_MAX + 1, 2 ** 32, 2 ** 63 - 1, 2 ** 63,
+                 -INT32_MAX - 1, -INT32_MAX - 2]
+NUMBER_LIKE = ["", " ", "1.5", "1,5", "1e3", " 1", "1 ", "+1", "０１", "0x10", "NaN", "Infinity", "1" * 40]
+
+
+def ico_check_digit(digits):
+    remainder = sum(int(d) * (8 - i) for i, d in enumerate(digits)) % 11
+    return (11 - remainder) % 10
+
+
+def valid_ico(rng):
+    digits = "".join(rng.choice(string.digits) for _ in range(7))
+    return digits + str(ico_check_digit(digits))
+
+
+def is_valid_ico(value):
+    return len(value) == 8 and value.isdigit() and ico_check_digit(value[:7]) == int(value[7])
+
+
+@dataclass
+class FieldSpec:
+    name: str
+    kind: str  # text, name, email, phone, ico, count
+    max_length: int = None
+    required: bool = True
+    baseline: str = ""  # valid value used while another field is varied
+
+
+# Forms under test, limits taken from the TestRail cases
+FORMS = {
+    "registration": [  # http://testovani.kitner.cz/regkurz/
+        FieldSpec("Název kurzu", "text", baseline="Jak se stát testerem"),
+        FieldSpec("Jméno", "name", 30, required=False, baseline="Jan"),
+        FieldSpec("Příjmení", "name", 30, required=False, baseline="Novák"),
+        FieldSpec("Adresa", "text", 300, baseline="Brno 20"),
+        FieldSpec("IČO", "ico", 8, required=False, baseline=""),
+        FieldSpec("Email", "email", 50, baseline="aa@bb.cc"),
+        FieldSpec("Telefon", "phone", 20, baseline="111222333"),
+        FieldSpec("Počet osob", "count", baseline="1"),
+        FieldSpec("Komentáře a dotazy ke školení", "text", 1000, required=False, baseline=""),
+    ],
+    "shipping_address": [  # iDoklad, Adresář / Dodací adresy
+        FieldSpec("Název dodací adresy", "text", 200, baseline="Sklad Brno"),
+        FieldSpec("Ulice", "text", 100, baseline="Masarykova 1"),
+        FieldSpec("PSČ", "text", 11, baseline="60200"),
+        FieldSpec("Město", "text", 50, baseline="Brno"),
+    ],
+    "login_api": [  # userauth.php of the Postman collection
+        FieldSpec("username", "text", 30, baseline="novak"),
+        FieldSpec("password", "text", baseline="heslo-novak"),
+    ],
+}
+
+
+# "valid", "invalid" or "unknown" for a value of a field, following the rules the TestRail cases expect
+def expected(spec, value):
+    if value.strip() == "":
+        return "invalid" if spec.required else "valid"
+    if spec.max_length is not None and len(value) > spec.max_length:
+        return "invalid"
+    if spec.kind == "name":
+        return "valid" if all(c.isalpha() or c in " -" for c in value) else "invalid"
+    if spec.kind == "email":
+        local, _, domain = value.rpartition("@")
+        return "valid" if local and "." in domain and not domain.startswith(".") else "invalid"
+    if spec.kind == "phone":
+        digits = value[4:] if value.startswith("+420") else value
+        return "valid" if len(digits) == 9 and digits.isdigit() and digits.strip("0") and digits[0] != "0" else "invalid"
+    if spec.kind == "ico":
+        return "valid" if is_valid_ico(value) else "invalid"
+    if spec.kind == "count":
+        return "valid" if value.isdigit() and value.isascii() and 0 < int(value) <= INT32_MAX else "invalid"
+    return "unknown" if any(c in UNICODE_CLASSES["punctuation"] + UNICODE_CLASSES["control"] for c in value) else "valid"
+
+
+# Hand-picked edges of a field: (category, value)
+def edge_values(spec, rng):
+    yield "empty", ""
+    yield "whitespace_only", "   "
+    if spec.max_length:
+        for length in sorted({1, spec.max_length - 1, spec.max_length, spec.max_length + 1, spec.max_length * 2}):
+            yield f"length_{length}", fill(spec, length, rng)
+    for name, chars in UNICODE_CLASSES.items():
+        yield f"unicode_{name}", "".join(rng.choice(chars) for _ in range(min(spec.max_length or 12, 12)))
+    for value in INJECTION:
+        yield "injection", value
+    if spec.kind in ("count", "phone", "ico"):
+        for value in INTEGER_EDGES:
+            yield "integer_edge", str(value)
+        for value in NUMBER_LIKE:
+            yield "number_like", value
+    if spec.kind == "phone":
+        for value in ["+420111222333", "000000000", "000000123", "+123000000000", "1" * 21, "77712345a"]:
+            yield "phone_format", value
+    if spec.kind == "ico":
+        good = valid_ico(rng)
+        yield "ico_checksum_ok", good
+        yield "ico_checksum_bad", good[:7] + str((int(good[7]) + 1) % 10)
+        for length in (7, 9, 12):
+            yield "ico_length", "".join(rng.choice(string.digits) for _ in range(length))
+    if spec.kind == "email":
+        for value in ["x@.cz", "spatnyemailseznam.cz", "ma.il@háčky.čárky.example.com",
+                      "!#$%&'*+-/=.?^_`{|}~@[IPv6:0123:4567:89AB:CDEF:0123:4567:89AB:CDEF]", "a@b", "a..b@example.com"]:
+            yield "email_format", value
+
+
+# Valid-looking value of exactly `length` characters
+def fill(spec, length, rng):
+    if spec.kind == "email":
+        # shorter lengths shrink the domain down to x@y.cz, anything below that cannot be an address
+        if length < 6:
+            return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        domain = "@example.cz"
+        if length <= len(domain):
+            domain = "@" + "".join(rng.choice(string.ascii_lowercase) for _ in range(length - 5)) + ".cz"
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(length - len(domain))) + domain
+    if spec.kind in ("phone", "ico", "count"):
+        return "".join(rng.choice(string.digits) for _ in range(length))
+    letters = string.ascii_letters + CZECH
+    return "".join(rng.choice(letters) for _ in range(length))
+
+
+# Random value around the field limits from a random mix of character classes
+def random_value(spec, rng):
+    limit = spec.max_length or 64
+    length = rng.choice([0, 1, limit - 1, limit, limit + 1, rng.randint(1, limit * 2)])
+    classes = rng.sample(sorted(UNICODE_CLASSES), rng.randint(1, 3))
+    chars = "".join(UNICODE_CLASSES[name] for name in classes)
+    return "random_" + "+".join(classes), "".join(rng.choice(chars) for _ in range(max(length, 0)))
+
+
+def record(number, form, spec, category, value, fields):
+    row = {spec_.name: spec_.baseline for spec_ in fields}
+    row[spec.name] = value
+    return {"case": number, "form": form, "field": spec.name, "category": category,
+            "expected": expected(spec, value), "values": row}
+
+
+# Streams `count` records for one form: all hand-picked edges first, then seeded random values in batches.
+# Each record changes one field and keeps the valid baseline everywhere else
+def generate(form, count, seed=0, batch_size=1000):
+    fields = FORMS[form]
+    rng = random.Random(seed)
+    edges = ((spec, category, value) for spec in fields for category, value in edge_values(spec, rng))
+    number = 0
+    for spec, category, value in itertools.islice(edges, count):
+        number += 1
+        yield record(number, form, spec, category, value, fields)
+    while number < count:
+        batch = min(batch_size, count - number)
+        specs = rng.choices(fields, k=batch)
+        for spec, (category, value) in zip(specs, [random_value(spec, rng) for spec in specs]):
+            number += 1
+            yield record(number, form, spec, category, value, fields)
+
+
+def write_jsonl(records, f):
+    written = 0
+    for item in records:
+        f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        written += 1
+    return written
+
+
+# One column per form field next to case/field/category/expected
+def write_csv(records, f, form):
+    columns = ["case", "field", "category", "expected"] + [spec.name for spec in FORMS[form]]
+    writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n")
+    writer.writerow(columns)
+    written = 0
+    for item in records:
+        writer.writerow([item["case"], item["field"], item["category"], item["expected"],
+                         *(item["values"][spec.name] for spec in FORMS[form])])
+        written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream boundary and invalid inputs for the tested forms")
+    parser.add_argument("form", choices=sorted(FORMS))
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("-o", "--output", help="default: stdout")
+    args = parser.parse_args()
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        records = generate(args.form, args.count, args.seed)
+        written = write_csv(records, out, args.form) if args.format == "csv" else write_jsonl(records, out)
+    finally:
+        if args.output:
+            out.close()
+    print(f"{written} {args.form} cases written", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
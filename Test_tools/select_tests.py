@@ -0,0 +1,176 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+
+from testrail_csv import TESTED_ON_FORMAT, iter_cases
+
+# Local results store shared by all test processes of a run (SQLite handles concurrent writers)
+RESULTS_STORE = os.environ.get("RESULTS_STORE", ".testrail_results.sqlite")
+
+# Columns describing what a case does, a change in any of them means the last pass no longer counts
+STEP_COLUMNS = ("preconditions", "steps", "expected_result")
+
+RERUN_STATUSES = ("Failed", "Retest")
+DUPLICATE_HEADER = re.compile(r" #\d+$")
+
+
+def steps_hash(case):
+    data = json.dumps([getattr(case, column) for column in STEP_COLUMNS], ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+# Results of automated runs plus the known state of linked defects
+class ResultsStore:
+    def __init__(self, path=RESULTS_STORE):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                case_id TEXT PRIMARY KEY, status TEXT, tested_on TEXT, tested_by TEXT, comment TEXT,
+                steps_hash TEXT, passed_hash TEXT);
+            CREATE TABLE IF NOT EXISTS defects (defect TEXT PRIMARY KEY, state TEXT);
+        """)
+
+    def result(self, case_id):
+        row = self.db.execute(
+            "SELECT status, tested_on, tested_by, comment, steps_hash, passed_hash FROM results WHERE case_id = ?",
+            (case_id,)).fetchone()
+        if row is None:
+            return None
+        keys = ("status", "tested_on", "tested_by", "comment", "steps_hash", "passed_hash")
+        result = dict(zip(keys, row))
+        result["tested_on"] = datetime.fromisoformat(result["tested_on"]) if result["tested_on"] else None
+        return result
+
+    def record(self, case, status, comment="", tested_by="automation", tested_on=None):
+        current = steps_hash(case)
+        tested_on = (tested_on or datetime.now()).replace(microsecond=0)
+        self.db.execute("""
+            INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (case_id) DO UPDATE SET status = excluded.status, tested_on = excluded.tested_on,
+                tested_by = excluded.tested_by, comment = excluded.comment, steps_hash = excluded.steps_hash,
+                passed_hash = COALESCE(excluded.passed_hash, results.passed_hash)
+        """, (case.case_id, status, tested_on.isoformat(), tested_by, comment, current,
+              current if status == "Passed" else None))
+        self.db.commit()
+
+    # A case that passed in TestRail before the store knew about it: its current steps are the passing ones
+    def baseline(self, case):
+        if case.status == "Passed" and self.result(case.case_id) is None:
+            self.record(case, "Passed", case.comment, case.tested_by, case.tested_on)
+
+    def set_defect(self, defect, state):
+        self.db.execute("INSERT OR REPLACE INTO defects VALUES (?, ?)", (defect, state))
+        self.db.commit()
+
+    # Defects the store has not heard of count as open
+    def is_open(self, defect):
+        row = self.db.execute("SELECT state FROM defects WHERE defect = ?", (defect,)).fetchone()
+        return row is None or row[0] != "closed"
+
+    def close(self):
+        self.db.close()
+
+
+# Stored result that is more recent than the one in the TestRail export
+def is_newer(result, case):
+    return result is not None and (case.tested_on is None or result["tested_on"] > case.tested_on)
+
+
+# Status of a case: the newer of the TestRail export and the local store
+def current_status(case, result):
+    if result and (is_newer(result, case) or result["tested_on"] == case.tested_on):
+        return result["status"]
+    return case.status
+
+
+# Why the case has to run, or None when it can be skipped
+def selection_reason(case, store):
+    store.baseline(case)
+    result = store.result(case.case_id)
+    status = current_status(case, result)
+    if status in RERUN_STATUSES:
+        return status
+    open_defects = [d for d in case.defects if store.is_open(d)]
+    if open_defects:
+        return "open defect " + ", ".join(open_defects)
+    if result is None or result["passed_hash"] is None:
+        return "never passed"
+    if result["passed_hash"] != steps_hash(case):
+        return "steps changed"
+    return None
+
+
+# Returns ([(case, reason)] to run, [case] to skip)
+def select(cases, store):
+    selected, skipped = [], []
+    for case in cases:
+        reason = selection_reason(case, store)
+        if reason:
+            selected.append((case, reason))
+        else:
+            skipped.append(case)
+    return selected, skipped
+
+
+# Writes the export back with the results of the store, same columns and quoting as TestRail exports it
+def write_results(path, cases, store):
+    cases = list(cases)
+    if not cases:
+        return 0
+    headers = list(cases[0].fields)
+    updated = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow([DUPLICATE_HEADER.sub("", header) for header in headers])
+        for case in cases:
+            fields = dict(case.fields)
+            result = store.result(case.case_id)
+            if is_newer(result, case):
+                fields.update({
+                    "Status": result["status"],
+                    "Tested On": result["tested_on"].strftime(TESTED_ON_FORMAT),
+                    "Tested By": result["tested_by"],
+                    "Comment": result["comment"],
+                })
+                updated += 1
+            # the export escapes quotes inside cells twice, see testrail_csv.unescape
+            writer.writerow([fields[header].replace('"', '""') for header in headers])
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Select the TestRail cases that need to run")
+    parser.add_argument("csv", nargs="+")
+    parser.add_argument("--store", default=RESULTS_STORE)
+    parser.add_argument("--close-defect", action="append", default=[])
+    parser.add_argument("--reopen-defect", action="append", default=[])
+    parser.add_argument("--write-results", metavar="DIR", help="write every export with the stored results into DIR")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.store)
+    for defect in args.close_defect:
+        store.set_defect(defect, "closed")
+    for defect in args.reopen_defect:
+        store.set_defect(defect, "open")
+
+    for path in args.csv:
+        cases = list(iter_cases(path))
+        selected, _ = select(cases, store)
+        print(f"\n{os.path.basename(path)}: {len(selected)} of {len(cases)} cases selected")
+        for case, reason in selected:
+            print(f"  {case.case_id:7} {reason:24} {case.title}")
+        if args.write_results:
+            os.makedirs(args.write_results, exist_ok=True)
+            out = os.path.join(args.write_results, os.path.basename(path))
+            print(f"  {write_results(out, cases, store)} results written to {out}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import argparse
+import itertools
+import math
+import os
+import random
+import re
+from dataclasses import dataclass, field
+
+from testrail_csv import iter_cases
+
+SKLIK_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Idoklad_shipping_address_testing",
+                         "sklik__vytvo_en__obsahov__kampan___banner_definov_n_extern_m_k_dem (1).csv")
+
+# "denní rozpočet [1000Kč(default)]" -> name, value, tag
+PARAMETER = re.compile(r"\s*([^\[\]]+?)\s*\[([^\]]*)\]")
+TAGGED = re.compile(r"^(.*?)\s*\((\w+)\)$")
+
+# The price field is named after the billing mode; both names are one dimension whose value depends on the mode
+ALIASES = {"cena za proklik": "cena", "cena za tisíc zobrazení": "cena"}
+DEPENDS_ON = {"cena": "způsob zpoplatnění"}
+
+
+@dataclass
+class SklikModel:
+    dimensions: dict = field(default_factory=dict)  # dimension -> levels in order of appearance
+    values: dict = field(default_factory=dict)  # (dimension, level, value of the dimension it depends on) -> text
+    names: dict = field(default_factory=dict)  # (dimension, value of the dimension it depends on) -> original name
+
+    def add_level(self, dimension, level):
+        levels = self.dimensions.setdefault(dimension, [])
+        if level not in levels:
+            levels.append(level)
+
+    def size(self):
+        return math.prod(len(levels) for levels in self.dimensions.values())
+
+
+# Title -> {dimension: level}; a tagged value like "1000Kč(default)" has the level "default"
+def parse_title(title, model):
+    params = {}
+    pairs = [(name.strip(), raw.strip()) for name, raw in PARAMETER.findall(title)]
+    raw_params = {ALIASES.get(name.lower(), name.lower()): (name, raw) for name, raw in pairs}
+    for dimension, (name, raw) in raw_params.items():
+        match = TAGGED.match(raw)
+        value, level = (match[1], match[2]) if match else (raw, raw)
+        parent = DEPENDS_ON.get(dimension)
+        context = raw_params[parent][1] if parent in raw_params else None
+        model.add_level(dimension, level)
+        model.values.setdefault((dimension, level, context), value)
+        model.names.setdefault((dimension, context), name)
+        params[dimension] = level
+    return params
+
+
+# Model and the hand-written rows [(case id, {dimension: level})] of an export
+def load(path=SKLIK_CSV):
+    model = SklikModel()
+    rows = [(case.id, parse_title(case.title, model)) for case in iter_cases(path)]
+    return model, rows
+
+
+# Extra levels, e.g. {"rozměr banneru": ["300x250", "728x90"]}
+def extend(model, extra):
+    for dimension, levels in extra.items():
+        for level in levels:
+            model.add_level(dimension.lower(), level)
+
+
+# The whole cartesian space, one dict at a time
+def full_space(model):
+    names = list(model.dimensions)
+    for levels in itertools.product(*model.dimensions.values()):
+        yield dict(zip(names, levels))
+
+
+# Every t-way combination of (dimension, level) pairs that a suite of strength t must contain
+def required_tuples(model, strength):
+    required = set()
+    for dimensions in itertools.combinations(model.dimensions, strength):
+        for levels in itertools.product(*(model.dimensions[d] for d in dimensions)):
+            required.add(tuple(zip(dimensions, levels)))
+    return required
+
+
+# t-way tuples of one case, dimensions in model order
+def case_tuples(case, strength, order):
+    return set(itertools.combinations(sorted(case.items(), key=lambda item: order[item[0]]), strength))
+
+
+# Greedy covering array (AETG style): every new row is the best of `candidates` randomly ordered greedy
+# constructions, each starting from a still uncovered tuple, until every t-way tuple is covered
+def covering_array(model, strength=2, seed=0, candidates=20, covered_by=()):
+    strength = min(strength, len(model.dimensions))
+    order = {d: i for i, d in enumerate(model.dimensions)}
+    uncovered = required_tuples(model, strength)
+    for case in covered_by:
+        uncovered -= case_tuples(case, strength, order)
+    rng = random.Random(seed)
+    suite = []
+
+    def gain(case):
+        return len(case_tuples(case, strength, order) & uncovered)
+
+    while uncovered:
+        best, best_gain = None, -1
+        for _ in range(candidates):
+            seed_tuple = rng.choice(sorted(uncovered))
+            case = dict(seed_tuple)
+            rest = [d for d in model.dimensions if d not in case]
+            rng.shuffle(rest)
+            for dimension in rest:
+                case[dimension] = max(model.dimensions[dimension],
+                                      key=lambda level: (gain({**case, dimension: level}), rng.random()))
+            case = {d: case[d] for d in model.dimensions}
+            case_gain = gain(case)
+            if case_gain > best_gain:
+                best, best_gain = case, case_gain
+        suite.append(best)
+        uncovered -= case_tuples(best, strength, order)
+    return suite
+
+
+# Share of the t-way tuples the given cases cover, and the ones still missing
+def coverage(model, cases, strength=2):
+    order = {d: i for i, d in enumerate(model.dimensions)}
+    required = required_tuples(model, strength)
+    covered = set()
+    for case in cases:
+        covered |= case_tuples(case, strength, order)
+    covered &= required
+    return len(covered) / len(required) if required else 1.0, sorted(required - covered)
+
+
+# Case -> title in the style of the export, with the concrete values where they are known
+def render(model, case):
+    parts = []
+    for dimension, level in case.items():
+        parent = DEPENDS_ON.get(dimension)
+        context = case.get(parent)
+        name = model.names.get((dimension, context)) or model.names.get((dimension, None)) or dimension
+        value = model.values.get((dimension, level, context))
+        if value is None:
+            parts.append(f"{name} [{level}]")
+        elif value == level:
+            parts.append(f"{name} [{value}]")
+        else:
+            parts.append(f"{name} [{value}({level})]")
+    return " ".join(parts)
+
+
+def parse_extra(items):
+    extra = {}
+    for item in items:
+        dimension, _, levels = item.partition("=")
+        extra.setdefault(dimension.strip(), []).extend(level.strip() for level in levels.split(",") if level.strip())
+    return extra
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expand the Sklik campaign cases and reduce them to an n-wise suite")
+    parser.add_argument("csv", nargs="?", default=SKLIK_CSV)
+    parser.add_argument("-t", "--strength", type=int, default=2, help="2 = pairwise")
+    parser.add_argument("--add", action="append", default=[], metavar="DIMENSION=LEVEL,LEVEL",
+                        help='extra levels, e.g. --add "Rozměr banneru=300x250,728x90"')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--new-only", action="store_true", help="only rows needed on top of the hand-written ones")
+    args = parser.parse_args()
+
+    model, rows = load(args.csv)
+    extend(model, parse_extra(args.add))
+    print("Dimensions:")
+    for dimension, levels in model.dimensions.items():
+        print(f"  {dimension:25} {', '.join(levels)}")
+    print(f"\nFull cartesian space: {model.size()} cases")
+
+    existing = [params for _, params in rows]
+    share, missing = coverage(model, existing, args.strength)
+    print(f"Hand-written rows: {len(rows)}, {share:.0%} of the {args.strength}-way combinations covered")
+    for combo in missing[:20]:
+        print("  missing " + " + ".join(f"{d}={level}" for d, level in combo))
+    if len(missing) > 20:
+        print(f"  ... {len(missing) - 20} more")
+
+    suite = covering_array(model, args.strength, args.seed, covered_by=existing if args.new_only else ())
+    label = "additional rows" if args.new_only else "rows"
+    print(f"\n{args.strength}-way suite: {len(suite)} {label} instead of {model.size()}")
+    for case in suite:
+        known = " (hand-written)" if case in existing else ""
+        print(f"  {render(model, case)}{known}")
+
+
+if __name__ == "__main__":
+    main()
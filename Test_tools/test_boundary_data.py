@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from boundary_data import FORMS, edge_values, expected, fill, generate
+
+EMAIL = next(spec for spec in FORMS["registration"] if spec.kind == "email")
+
+
+@pytest.mark.parametrize("length", range(0, 2 * EMAIL.max_length + 1))
+def test_email_fill_has_exact_length(length):
+    assert len(fill(EMAIL, length, random.Random(length))) == length
+
+
+def test_email_length_edges():
+    edges = {category: value for category, value in edge_values(EMAIL, random.Random(0)) if category.startswith("length_")}
+    assert set(edges) == {f"length_{n}" for n in (1, EMAIL.max_length - 1, EMAIL.max_length, EMAIL.max_length + 1,
+                                                  EMAIL.max_length * 2)}
+    for category, value in edges.items():
+        assert len(value) == int(category[len("length_"):])
+    assert expected(EMAIL, edges["length_1"]) == "invalid"
+    assert expected(EMAIL, edges[f"length_{EMAIL.max_length}"]) == "valid"
+    assert expected(EMAIL, edges[f"length_{EMAIL.max_length + 1}"]) == "invalid"
+
+
+def test_generation_is_seeded():
+    assert list(generate("registration", 300, seed=7)) == list(generate("registration", 300, seed=7))
+    assert list(generate("registration", 300, seed=7)) != list(generate("registration", 300, seed=8))
@@ -0,0 +1,47 @@
+import dataclasses
+import os
+
+import pytest
+
+from select_tests import ResultsStore, select, selection_reason
+from testrail_csv import iter_cases
+
+IDOKLAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Idoklad_shipping_address_testing",
+                       "Idoklad.cz_testing_shipping_address.csv")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    yield store
+    store.close()
+
+
+def test_failed_retest_and_open_defects_are_selected(store):
+    cases = list(iter_cases(IDOKLAD))
+    selected, skipped = select(cases, store)
+    reasons = {case.case_id: reason for case, reason in selected}
+    for case in cases:
+        if case.status in ("Failed", "Retest"):
+            assert reasons[case.case_id] == case.status
+        elif case.defects:
+            assert reasons[case.case_id] == "open defect " + ", ".join(case.defects)
+        else:
+            assert case in skipped
+
+
+# A case that passed in a later automated run still runs while its defect is open
+def test_closed_defect_is_skipped(store):
+    case = next(case for case in iter_cases(IDOKLAD) if case.defects == ["ID-1221"])
+    assert selection_reason(case, store) == case.status
+    store.record(case, "Passed")
+    assert selection_reason(case, store) == "open defect ID-1221"
+    store.set_defect("ID-1221", "closed")
+    assert selection_reason(case, store) is None
+
+
+def test_changed_steps_are_selected(store):
+    case = next(case for case in iter_cases(IDOKLAD) if case.status == "Passed" and not case.defects)
+    assert selection_reason(case, store) is None
+    changed = dataclasses.replace(case, steps=case.steps + "\nKliknu na Uložit")
+    assert selection_reason(changed, store) == "steps changed"
@@ -0,0 +1,33 @@
+import itertools
+
+import pytest
+
+from sklik_matrix import SklikModel, coverage, covering_array, extend, load
+
+
+@pytest.fixture(scope="module")
+def sklik():
+    return load()
+
+
+def test_pairwise_covers_every_pair(sklik):
+    model, _ = sklik
+    suite = covering_array(model, strength=2)
+    assert coverage(model, suite, 2) == (1.0, [])
+    assert len(suite) < model.size()
+
+
+def test_new_rows_complete_the_hand_written_ones(sklik):
+    model, rows = sklik
+    cases = [case for _, case in rows]
+    suite = covering_array(model, strength=2, covered_by=cases)
+    assert coverage(model, cases + suite, 2)[0] == 1.0
+
+
+def test_three_way_on_a_small_model():
+    model = SklikModel()
+    extend(model, {"a": ["1", "2"], "b": ["1", "2"], "c": ["1", "2", "3"], "d": ["1", "2"]})
+    suite = covering_array(model, strength=3, seed=1)
+    assert coverage(model, suite, 3) == (1.0, [])
+    for a, b, c in itertools.product("12", "12", "123"):
+        assert any(case["a"] == a and case["b"] == b and case["c"] == c for case in suite)
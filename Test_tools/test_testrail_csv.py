@@ -0,0 +1,47 @@
+import os
+import shutil
+
+import pytest
+
+from select_tests import ResultsStore, write_results
+from testrail_csv import TestRailIndex, iter_cases
+
+REPO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+EXPORTS = [
+    os.path.join(REPO_DIR, "User_registration_testing", "User_registration_testing.csv"),
+    os.path.join(REPO_DIR, "Idoklad_shipping_address_testing", "Idoklad.cz_testing_shipping_address.csv"),
+]
+IDOKLAD = EXPORTS[1]
+
+
+@pytest.mark.parametrize("export", EXPORTS, ids=os.path.basename)
+def test_round_trip_keeps_the_export(export, tmp_path):
+    cases = list(iter_cases(export))
+    store = ResultsStore(str(tmp_path / "results.sqlite"))
+    try:
+        assert write_results(tmp_path / "out.csv", cases, store) == 0
+    finally:
+        store.close()
+    with open(export, "rb") as original, open(tmp_path / "out.csv", "rb") as written:
+        assert written.read() == original.read()
+
+
+def test_multiline_cells_and_duplicate_headers():
+    case = next(case for case in iter_cases(IDOKLAD) if case.case_id == "C1347")
+    assert "\n" in case.steps
+    assert "Steps #2" in case.fields
+    assert case.defects == ["ID-1188"]
+
+
+def test_index_queries_failed_and_defect(tmp_path):
+    export = shutil.copy(IDOKLAD, tmp_path / "export.csv")
+    index = TestRailIndex(str(export))
+    try:
+        failed = list(index.query(status="Failed"))
+        assert len(failed) == 5 and all(case.status == "Failed" for case in failed)
+        linked = [case.case_id for case in index.query(defect="ID-1221")]
+        assert linked and "C1348" in linked
+        assert all("ID-1221" in index.get(case_id).defects for case_id in linked)
+        assert index.counts("status") == {"Failed": 5, "Passed": 25, "Retest": 5}
+    finally:
+        index.close()
@@ -0,0 +1,241 @@
+import argparse
+import csv
+import io
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+
+TESTED_ON_FORMAT = "%m/%d/%Y %I:%M %p"
+JIRA_KEY = re.compile(r"/browse/([A-Z][A-Z0-9]+-\d+)")
+
+
+@dataclass
+class TestCase:
+    id: str
+    case_id: str
+    title: str
+    section: str
+    status: str
+    priority: str
+    defects: list
+    tested_on: datetime
+    tested_by: str
+    preconditions: str
+    steps: str
+    expected_result: str
+    comment: str
+    fields: dict = field(repr=False)  # every column of the export, duplicate headers renamed
+
+    __test__ = False  # not a pytest test class
+
+
+# TestRail exports some headers twice ("Steps", "Steps"), the second one becomes "Steps #2"
+def unique_headers(headers):
+    seen = {}
+    result = []
+    for header in headers:
+        seen[header] = seen.get(header, 0) + 1
+        result.append(header if seen[header] == 1 else f"{header} #{seen[header]}")
+    return result
+
+
+# Quotes inside cells are escaped twice in the export: """"Adresář"""" -> ""Adresář"" after csv
+def unescape(value):
+    return value.replace('""', '"')
+
+
+def parse_tested_on(value):
+    try:
+        return datetime.strptime(value.strip(), TESTED_ON_FORMAT)
+    except ValueError:
+        return None
+
+
+def parse_defects(fields):
+    defects = [d.strip() for d in fields.get("Defects", "").split(",") if d.strip()]
+    for key in JIRA_KEY.findall(fields.get("Comment", "")):
+        if key not in defects:
+            defects.append(key)
+    return defects
+
+
+# First non-empty of the duplicated columns, e.g. "Steps" / "Steps #2"
+def first_filled(fields, name):
+    for key, value in fields.items():
+        if (key == name or key.startswith(name + " #")) and value.strip():
+            return value
+    return ""
+
+
+def to_test_case(headers, values):
+    fields = {header: unescape(value) for header, value in zip(headers, values)}
+    return TestCase(
+        id=fields.get("ID", ""),
+        case_id=fields.get("Case ID", ""),
+        title=fields.get("Title", ""),
+        section=fields.get("Section", ""),
+        status=fields.get("Status", ""),
+        priority=fields.get("Priority", ""),
+        defects=parse_defects(fields),
+        tested_on=parse_tested_on(fields.get("Tested On", "")),
+        tested_by=fields.get("Tested By", ""),
+        preconditions=fields.get("Preconditions", ""),
+        steps=first_filled(fields, "Steps") or fields.get("Steps (Step)", ""),
+        expected_result=fields.get("Expected Result", "") or fields.get("Steps (Expected Result)", ""),
+        comment=fields.get("Comment", ""),
+        fields=fields,
+    )
+
+
+# Yields (byte offset, raw bytes) of every CSV record; a record ends on a line with balanced quotes,
+# so multi-line cells stay together and the file is never loaded as a whole
+def iter_raw_records(f):
+    offset = f.tell()
+    lines = []
+    quotes = 0
+    for line in f:
+        lines.append(line)
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            record = b"".join(lines)
+            yield offset, record
+            offset += len(record)
+            lines = []
+            quotes = 0
+    if lines:
+        yield offset, b"".join(lines)
+
+
+def parse_record(raw):
+    rows = list(csv.reader(io.StringIO(raw.decode("utf-8-sig"), newline="")))
+    return rows[0] if rows else []
+
+
+def read_headers(f):
+    f.seek(0)
+    _, raw = next(iter_raw_records(f))
+    return unique_headers(parse_record(raw)), len(raw)
+
+
+# Streams the export record by record as TestCase objects
+def iter_cases(path):
+    with open(path, "rb") as f:
+        headers, _ = read_headers(f)
+        for _, raw in iter_raw_records(f):
+            values = parse_record(raw)
+            if values:
+                yield to_test_case(headers, values)
+
+
+# On-disk SQLite index of an export (Case ID, Section, Status, Defects -> byte offset of the record).
+# Queries only seek to the matching records; the index is rebuilt when the CSV changes
+class TestRailIndex:
+    __test__ = False
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + ".idx.sqlite"
+        self.db = sqlite3.connect(self.index_path)
+        if not self._is_current():
+            self.build()
+
+    def _source_stamp(self):
+        stat = os.stat(self.path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _is_current(self):
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        except sqlite3.OperationalError:
+            return False
+        return row is not None and row[0] == self._source_stamp()
+
+    def build(self):
+        db = self.db
+        db.executescript("""
+            DROP TABLE IF EXISTS meta;
+            DROP TABLE IF EXISTS cases;
+            DROP TABLE IF EXISTS defects;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE cases (offset INTEGER PRIMARY KEY, test_id TEXT, case_id TEXT, section TEXT, status TEXT);
+            CREATE TABLE defects (offset INTEGER, defect TEXT);
+        """)
+        with open(self.path, "rb") as f:
+            headers, _ = read_headers(f)
+            for offset, raw in iter_raw_records(f):
+                values = parse_record(raw)
+                if not values:
+                    continue
+                case = to_test_case(headers, values)
+                db.execute("INSERT INTO cases VALUES (?, ?, ?, ?, ?)", (offset, case.id, case.case_id, case.section, case.status))
+                db.executemany("INSERT INTO defects VALUES (?, ?)", [(offset, d) for d in case.defects])
+        db.executescript("""
+            CREATE INDEX cases_case_id ON cases (case_id);
+            CREATE INDEX cases_section_status ON cases (section, status);
+            CREATE INDEX cases_status ON cases (status);
+            CREATE INDEX defects_defect ON defects (defect);
+        """)
+        db.execute("INSERT INTO meta VALUES ('source', ?)", (self._source_stamp(),))
+        db.commit()
+
+    def offsets(self, case_id=None, section=None, status=None, defect=None):
+        sql = "SELECT DISTINCT cases.offset FROM cases"
+        conditions, params = [], []
+        if defect is not None:
+            sql += " JOIN defects ON defects.offset = cases.offset"
+            conditions.append("defects.defect = ?")
+            params.append(defect)
+        for column, value in (("case_id", case_id), ("section", section), ("status", status)):
+            if value is not None:
+                conditions.append(f"cases.{column} = ?")
+                params.append(value)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return [row[0] for row in self.db.execute(sql + " ORDER BY cases.offset", params)]
+
+    # e.g. index.query(section="Adresář", status="Failed")
+    def query(self, **criteria):
+        offsets = self.offsets(**criteria)
+        if not offsets:
+            return
+        with open(self.path, "rb") as f:
+            headers, _ = read_headers(f)
+            for offset in offsets:
+                f.seek(offset)
+                _, raw = next(iter_raw_records(f))
+                yield to_test_case(headers, parse_record(raw))
+
+    def get(self, case_id):
+        return next(self.query(case_id=case_id), None)
+
+    def counts(self, column):
+        if column not in ("section", "status"):
+            raise ValueError(f"Counts are available for section and status, not {column}")
+        return dict(self.db.execute(f"SELECT {column}, COUNT(*) FROM cases GROUP BY {column} ORDER BY {column}"))
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query a TestRail CSV export through its on-disk index")
+    parser.add_argument("csv")
+    parser.add_argument("--case-id")
+    parser.add_argument("--section")
+    parser.add_argument("--status")
+    parser.add_argument("--defect")
+    args = parser.parse_args()
+
+    index = TestRailIndex(args.csv)
+    cases = list(index.query(case_id=args.case_id, section=args.section, status=args.status, defect=args.defect))
+    for case in cases:
+        defects = f"  [{', '.join(case.defects)}]" if case.defects else ""
+        print(f"{case.case_id:7} {case.status:8} {case.section:20} {case.title}{defects}")
+    print(f"\n{len(cases)} cases")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()